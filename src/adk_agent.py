@@ -3,17 +3,13 @@
 Hybrid ADK Agent that demonstrates LLM-based decision making with BigQuery MCP tools
 """
 
-import os
 import sys
 import asyncio
 import json
+import logging
 import re
-from dotenv import load_dotenv
 
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
-
-# Load configuration from centralized config module
+# Load configuration from centralized config module (which loads .env once)
 from src.config import (
     ADK_MODEL,
     ADK_AGENT_NAME,
@@ -32,7 +28,19 @@ from src.config import (
 from src.mcp_server import bq_client
 
 # Import LLM manager
-from src.llm_manager import generate_llm_response
+from src.llm_manager import generate_llm_response, generate_llm_response_stream
+
+# Debug output goes through logging so the (sometimes multi-KB) message
+# formatting is skipped entirely unless DEBUG is enabled
+log = logging.getLogger(__name__)
+
+# Prefer orjson's C parser for the per-request JSON decoding; both its
+# JSONDecodeError and stdlib's subclass ValueError, so callers catch that
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Define the tools available to the agent
 TOOLS_DESCRIPTION = f"""
@@ -48,39 +56,144 @@ For example, to get the first 10 rows of a table, use: SELECT * FROM `{PROJECT_I
 Always be specific about which dataset and table you want to query.
 """
 
-# Define the actual tool functions that map to MCP server functions
+# The tool-decision prompt is static except for the user question, so the
+# template parts are built once at import time instead of re-interpolating
+# the ~2KB f-string on every run_agent call. A stable prefix also keeps the
+# prompt friendly to provider-side prompt caching.
+_PROMPT_PREFIX = f"""
+You are a helpful AI assistant that can analyze data in Google BigQuery and answer questions about it.
+
+You have access to BigQuery tools and can:
+1. List datasets in the project (`list_dataset_ids`)
+2. Get information about datasets (`get_dataset_info`)
+3. List tables in datasets (`list_table_ids`)
+4. Get information about tables (`get_table_info`)
+5. Execute SQL queries to analyze data (`execute_sql`)
+
+Important context:
+- The available dataset is: {DATASET_ID}
+- The available table is: {TABLE_ID} (in the {DATASET_ID} dataset)
+- This table contains Indian stock market data with columns including ticker, stock names, sectors, industries, and other financial information
+- The table has 93 rows and 17 columns
+
+For each user question, decide which tool(s) to use based on what information is needed:
+- For questions about what datasets/tables exist, use list_dataset_ids, list_table_ids, etc.
+- For questions about the nature, structure, or summary of data, first get table info, then execute appropriate SQL queries
+- For questions asking to see sample data, use execute_sql with LIMIT queries
+- For analytical questions about stocks, use execute_sql with appropriate WHERE clauses
+- For questions about stocks with specific criteria, use execute_sql with filtering conditions
+
+Available schema:
+`{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+
+User question: """
+
+_PROMPT_SUFFIX = f"""
+
+CRITICAL INSTRUCTIONS:
+1. Think step by step about what information is needed to answer the question
+2. For analytical questions, generate appropriate SQL queries that directly answer the user's question
+3. For stock-related questions, remember that the {TABLE_ID} table contains stock data
+4. Use proper BigQuery syntax with backticks for table names: `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+5. For filtering queries, use appropriate WHERE clauses to get exactly what the user is asking for
+
+Use this JSON format:
+{{
+  "tool_calls": [
+    {{
+      "name": "tool_name",
+      "arguments": {{"param1": "value1", "param2": "value2"}}
+    }}
+  ]
+}}
+
+If you need multiple tools, include them in the array.
+If you don't need any tools, respond with an empty array.
+
+Examples:
+- For "What datasets do I have?" -> use list_dataset_ids
+- For "What tables are in the {DATASET_ID} dataset?" -> use list_table_ids with dataset_id="{DATASET_ID}"
+- For "What is the nature of data in the {TABLE_ID} table?" -> use get_table_info then execute_sql with descriptive queries
+- For "Summarize the {TABLE_ID} table" -> use get_table_info then execute_sql with aggregation queries
+- For "Show me sample data from {TABLE_ID}" -> use execute_sql with SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}` LIMIT 10
+- For "Fetch stocks with valid industry" -> use execute_sql with SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}` WHERE Industry IS NOT NULL AND Industry != '' LIMIT 10
+- For "How many stocks are there?" -> use execute_sql with SELECT COUNT(*) FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+- For "What sectors are represented?" -> use execute_sql with SELECT DISTINCT Sector FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}` WHERE Sector IS NOT NULL
+"""
+
+# Define the actual tool functions that map to MCP server functions.
+# The underlying BigQuery client is synchronous, so each call is pushed to a
+# worker thread; otherwise these coroutines would pin the event loop for the
+# duration of the RPC and gather() could never actually overlap them.
 async def list_dataset_ids():
     """List all dataset IDs in the project"""
-    return bq_client.list_datasets()
+    return await asyncio.to_thread(bq_client.list_datasets)
 
 async def get_dataset_info(dataset_id: str):
     """Get information about a specific dataset"""
-    return bq_client.get_dataset_info(dataset_id)
+    return await asyncio.to_thread(bq_client.get_dataset_info, dataset_id)
 
 async def list_table_ids(dataset_id: str):
     """List all table IDs in a dataset"""
-    return bq_client.list_tables(dataset_id)
+    return await asyncio.to_thread(bq_client.list_tables, dataset_id)
 
 async def get_table_info(dataset_id: str, table_id: str):
     """Get information about a specific table"""
-    return bq_client.get_table_info(dataset_id, table_id)
+    return await asyncio.to_thread(bq_client.get_table_info, dataset_id, table_id)
 
 async def execute_sql(query: str):
-    """Execute a SQL query and return the results"""
-    return bq_client.execute_query(query)
+    """Execute a SQL query and return the results
+
+    Caching, single-flight coalescing of identical in-flight queries and
+    the nondeterministic-SQL bypass all live in execute_query_async, so
+    there is one cache with one TTL and one invalidation point.
+    """
+    return await bq_client.execute_query_async(query)
+
+# Precompiled intent patterns for the no-LLM fallback path, built once at
+# import instead of running a pile of substring scans per request
+_DATASET_QUERY_RE = re.compile(r"(?is)(?=.*dataset)(?=.*(?:what|list|have))")
+_SHOW_ROWS_RE = re.compile(r"(?is)(?=.*(?:show|display|get))(?=.*indianapi)(?=.*(?:row|data|record))")
+_HELP_RE = re.compile(r"(?i)help|what can")
+
+# Trivial questions with a fixed answer shape skip the LLM round trip
+# entirely: no tokens billed, no provider latency. Both patterns are
+# anchored to the whole question so anything with a qualifier ("how many
+# stocks have PE above 10?") still goes through the LLM for a WHERE clause.
+_LIST_DATASETS_RE = re.compile(
+    r"(?i)^\s*(?:"
+    r"(?:what|which)\s+datasets?\s+(?:are\s+(?:there|available)|do\s+(?:we|you|i)\s+have|exist)"
+    r"|list\s+(?:all\s+)?(?:the\s+)?(?:available\s+)?datasets?"
+    r")\s*[?.!]?\s*$"
+)
+_ROW_COUNT_RE = re.compile(
+    r"(?i)^\s*how many\s+(?:rows|records)"
+    r"(?:\s+are\s+there)?"
+    r"(?:\s+in\s+(?:the\s+|this\s+)?(?:table|dataset|data))?"
+    r"\s*[?.!]?\s*$"
+)
+
+# Precompiled fallback pattern for JSON wrapped in markdown code fences.
+# The greedy inner group avoids the pathological backtracking that lazy
+# quantifiers can trigger on long responses.
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
 
 def extract_json_from_response(response_text):
     """Extract JSON from response text, handling various formatting issues"""
-    # First, try to find JSON between code blocks
-    json_match = re.search(r"```(?:json)?\s*({.*?})\s*```", response_text, re.DOTALL)
-    if json_match:
-        return json_match.group(1)
-    
-    # If no code blocks, try to find JSON object directly
-    json_match = re.search(r"({.*?})\s*$", response_text, re.DOTALL)
+    response_text = response_text.strip()
+
+    # Fast path: the prompt asks for raw JSON, so most responses parse directly
+    try:
+        _json_loads(response_text)
+        return response_text
+    except ValueError:
+        pass
+
+    # Fall back to finding JSON between markdown code blocks
+    json_match = _JSON_BLOCK_RE.search(response_text)
     if json_match:
         return json_match.group(1)
-    
+
     # Return original text if no JSON found
     return response_text
 
@@ -101,163 +214,154 @@ def format_sql_results_as_table(results):
     if not isinstance(results[0], dict):
         return str(results)
     
-    columns = list(results[0].keys())
-    
+    columns = tuple(results[0].keys())
+
     # Create table header
     header = "| " + " | ".join(columns) + " |"
     separator = "|" + "|".join(["---" for _ in columns]) + "|"
-    
-    # Create table rows
-    rows = []
-    for row in results:
-        if isinstance(row, dict):
-            row_values = []
-            for col in columns:
-                value = row.get(col, "")
-                # Handle different data types
-                if value is None:
-                    row_values.append("NULL")
-                elif isinstance(value, (int, float, bool)):
-                    row_values.append(str(value))
-                else:
-                    # Truncate long strings for better display
-                    str_value = str(value)
-                    if len(str_value) > 50:
-                        str_value = str_value[:47] + "..."
-                    row_values.append(str_value)
-            rows.append("| " + " | ".join(row_values) + " |")
-    
+
+    # Hoist builtins into locals: BigQuery returns uniformly-shaped rows, so
+    # the inner loop only pays for formatting, not shape re-validation
+    _str = str
+    _len = len
+    _isinstance = isinstance
+    _scalar = (int, float, bool)
+
+    def _fmt(value):
+        # Handle different data types
+        if value is None:
+            return "NULL"
+        if _isinstance(value, _scalar):
+            return _str(value)
+        # Truncate long strings for better display; short values (tickers,
+        # sector names) return as-is without any slice allocation
+        str_value = _str(value)
+        return str_value if _len(str_value) <= 50 else str_value[:47] + "..."
+
+    # Create table rows in a single pass; row shape was validated above, so
+    # every row is treated as a dict without per-row isinstance checks
+    rows = "\n".join(
+        "| " + " | ".join(_fmt(row.get(col, "")) for col in columns) + " |"
+        for row in results
+    )
+
     # Combine all parts
-    table_lines = [header, separator] + rows
-    return "\n".join(table_lines)
+    return "\n".join((header, separator, rows))
+
+# Tool dispatch table: maps each tool name to its function and the argument
+# names it accepts, so extra parameters the LLM invents are dropped without a
+# per-call if/elif ladder
+_TOOL_SPEC = {
+    "list_dataset_ids": (list_dataset_ids, frozenset()),
+    "get_dataset_info": (get_dataset_info, frozenset({"dataset_id"})),
+    "list_table_ids": (list_table_ids, frozenset({"dataset_id"})),
+    "get_table_info": (get_table_info, frozenset({"dataset_id", "table_id"})),
+    "execute_sql": (execute_sql, frozenset({"query"})),
+}
+
+# The LLM sometimes names the SQL parameter 'sql' or 'sql_query' instead of 'query'
+_SQL_ALIASES = {"sql": "query", "sql_query": "query"}
+
+async def _dispatch_tool_call(tool_name, arguments):
+    """Route a single LLM tool call to the matching tool function"""
+    log.debug("Executing tool: %s with args: %s", tool_name, arguments)
+
+    spec = _TOOL_SPEC.get(tool_name)
+    if spec is None:
+        return {"error": f"Unknown tool: {tool_name}"}
+
+    fn, allowed = spec
+    valid_args = {
+        alias: v
+        for k, v in arguments.items()
+        if (alias := _SQL_ALIASES.get(k, k)) in allowed
+    }
+    return await fn(**valid_args)
 
 async def run_agent(prompt: str):
     """Run the agent with a given prompt using the LLM to decide what tools to use"""
-    print(f"DEBUG: LLM_PROVIDER is set: {LLM_PROVIDER}")
-    print(f"DEBUG: GOOGLE_API_KEY is set: {bool(GOOGLE_API_KEY)}")
-    print(f"DEBUG: OPENAI_API_KEY is set: {bool(OPENAI_API_KEY)}")
+    log.debug("LLM_PROVIDER is set: %s", LLM_PROVIDER)
+    log.debug("GOOGLE_API_KEY is set: %s", bool(GOOGLE_API_KEY))
+    log.debug("OPENAI_API_KEY is set: %s", bool(OPENAI_API_KEY))
     
     try:
-        # If API key is available for the configured provider, use the LLM to decide what tools to use
-        if (LLM_PROVIDER == 'gemini' and GOOGLE_API_KEY) or (LLM_PROVIDER == 'openai' and OPENAI_API_KEY):
-            try:
-                # Create the prompt with tool descriptions
-                full_prompt = f"""
-You are a helpful AI assistant that can analyze data in Google BigQuery and answer questions about it.
-
-You have access to BigQuery tools and can:
-1. List datasets in the project (`list_dataset_ids`)
-2. Get information about datasets (`get_dataset_info`)
-3. List tables in datasets (`list_table_ids`)
-4. Get information about tables (`get_table_info`)
-5. Execute SQL queries to analyze data (`execute_sql`)
-
-Important context:
-- The available dataset is: {DATASET_ID}
-- The available table is: {TABLE_ID} (in the {DATASET_ID} dataset)
-- This table contains Indian stock market data with columns including ticker, stock names, sectors, industries, and other financial information
-- The table has 93 rows and 17 columns
+        # Answer trivial questions locally before paying for an LLM round trip
+        if _LIST_DATASETS_RE.search(prompt):
+            datasets = await list_dataset_ids()
+            return f"Here are your datasets: {', '.join(datasets) if datasets else 'No datasets found'}"
 
-For each user question, decide which tool(s) to use based on what information is needed:
-- For questions about what datasets/tables exist, use list_dataset_ids, list_table_ids, etc.
-- For questions about the nature, structure, or summary of data, first get table info, then execute appropriate SQL queries
-- For questions asking to see sample data, use execute_sql with LIMIT queries
-- For analytical questions about stocks, use execute_sql with appropriate WHERE clauses
-- For questions about stocks with specific criteria, use execute_sql with filtering conditions
+        if _ROW_COUNT_RE.search(prompt):
+            query = f"SELECT COUNT(*) AS row_count FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`"
+            result = await execute_sql(query)
+            table_output = format_sql_results_as_table(result)
+            return f"Row count for the {TABLE_ID} table:\n{table_output}"
 
-Available schema:
-`{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+        # If API key is available for the configured provider, use the LLM to decide what tools to use
+        if (LLM_PROVIDER == 'gemini' and GOOGLE_API_KEY) or (LLM_PROVIDER == 'openai' and OPENAI_API_KEY):
+            # Speculatively fetch the default table schema while the LLM is
+            # thinking: for most analytical prompts the first tool the model
+            # picks is get_table_info on the configured table, so the RPC
+            # round-trip hides under the LLM latency
+            schema_task = asyncio.create_task(get_table_info(DATASET_ID, TABLE_ID))
+            schema_task_used = False
 
-User question: {prompt}
+            def _coro_for(tool_call):
+                nonlocal schema_task_used
+                tool_name = tool_call.get("name")
+                arguments = tool_call.get("arguments", {}) or {}
+                if (tool_name == "get_table_info"
+                        and arguments.get("dataset_id", DATASET_ID) == DATASET_ID
+                        and arguments.get("table_id", TABLE_ID) == TABLE_ID):
+                    schema_task_used = True
+                    return schema_task
+                return _dispatch_tool_call(tool_name, arguments)
 
-CRITICAL INSTRUCTIONS:
-1. ALWAYS respond with valid JSON in the exact format specified
-2. Think step by step about what information is needed to answer the question
-3. For analytical questions, generate appropriate SQL queries that directly answer the user's question
-4. For stock-related questions, remember that the {TABLE_ID} table contains stock data
-5. Use proper BigQuery syntax with backticks for table names: `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
-6. For filtering queries, use appropriate WHERE clauses to get exactly what the user is asking for
-
-Respond ONLY with a JSON object in this format:
-{{
-  "tool_calls": [
-    {{
-      "name": "tool_name",
-      "arguments": {{"param1": "value1", "param2": "value2"}}
-    }}
-  ]
-}}
+            try:
+                # Assemble the prompt from the prebuilt static template parts
+                full_prompt = _PROMPT_PREFIX + prompt + _PROMPT_SUFFIX
 
-If you need multiple tools, include them in the array.
-If you don't need any tools, respond with an empty array.
+                log.debug("About to call LLM...")
+                # Stream the response from our LLM manager, asking the
+                # provider for structured JSON so no post-processing is
+                # needed. Streaming avoids buffering the whole response
+                # server-side; the small tool plan is parsed once complete
+                # rather than re-parsed per chunk.
+                chunks = []
+                async for chunk in generate_llm_response_stream(full_prompt, json_output=True):
+                    chunks.append(chunk)
+                response_text = "".join(chunks)
+                log.debug("LLM response received: %s", response_text)
 
-Examples:
-- For "What datasets do I have?" -> use list_dataset_ids
-- For "What tables are in the {DATASET_ID} dataset?" -> use list_table_ids with dataset_id="{DATASET_ID}"
-- For "What is the nature of data in the {TABLE_ID} table?" -> use get_table_info then execute_sql with descriptive queries
-- For "Summarize the {TABLE_ID} table" -> use get_table_info then execute_sql with aggregation queries
-- For "Show me sample data from {TABLE_ID}" -> use execute_sql with SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}` LIMIT 10
-- For "Fetch stocks with valid industry" -> use execute_sql with SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}` WHERE Industry IS NOT NULL AND Industry != '' LIMIT 10
-- For "How many stocks are there?" -> use execute_sql with SELECT COUNT(*) FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
-- For "What sectors are represented?" -> use execute_sql with SELECT DISTINCT Sector FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}` WHERE Sector IS NOT NULL
-"""
-                
-                print("DEBUG: About to call LLM...")
-                # Generate the response using our LLM manager
-                response_text = await generate_llm_response(full_prompt)
-                print(f"DEBUG: LLM response received: {response_text}")
-                
-                # Clean up the response text by removing markdown code block formatting
                 response_text = response_text.strip()
-                print(f"DEBUG: Raw LLM response text: {response_text}")
-                
-                # Extract JSON from response
-                json_text = extract_json_from_response(response_text)
-                json_text = json_text.strip()
-                print(f"DEBUG: Extracted JSON text: {json_text}")
-                
+                json_text = response_text
+
                 # Try to parse the response as JSON
                 try:
-                    tool_decision = json.loads(json_text)
+                    try:
+                        # JSON output mode means the response parses directly
+                        tool_decision = _json_loads(response_text)
+                    except ValueError:
+                        # Fallback for providers that still wrap JSON in code fences
+                        json_text = extract_json_from_response(response_text)
+                        tool_decision = _json_loads(json_text)
                     tool_calls = tool_decision.get("tool_calls", [])
                     
-                    print(f"DEBUG: Tool calls to execute: {tool_calls}")
+                    log.debug("Tool calls to execute: %s", tool_calls)
                     
-                    # Execute the tool calls
+                    # Execute independent tool calls concurrently so wall-clock
+                    # latency is bounded by the slowest call, not the sum
+                    raw_results = await asyncio.gather(
+                        *(_coro_for(tc) for tc in tool_calls),
+                        return_exceptions=True,
+                    )
+
                     results = []
-                    for tool_call in tool_calls:
+                    for tool_call, result in zip(tool_calls, raw_results):
                         tool_name = tool_call.get("name")
-                        arguments = tool_call.get("arguments", {})
-                        
-                        print(f"DEBUG: Executing tool: {tool_name} with args: {arguments}")
-                        
-                        # Call the appropriate tool function
-                        if tool_name == "list_dataset_ids":
-                            result = await list_dataset_ids()
-                        elif tool_name == "get_dataset_info":
-                            # Handle the case where LLM might generate extra parameters
-                            valid_args = {k: v for k, v in arguments.items() if k in ['dataset_id']}
-                            result = await get_dataset_info(**valid_args)
-                        elif tool_name == "list_table_ids":
-                            result = await list_table_ids(**arguments)
-                        elif tool_name == "get_table_info":
-                            # Handle the case where LLM might generate extra parameters like project_id
-                            valid_args = {k: v for k, v in arguments.items() if k in ['dataset_id', 'table_id']}
-                            result = await get_table_info(**valid_args)
-                        elif tool_name == "execute_sql":
-                            # Handle the case where LLM generates 'sql' or 'sql_query' instead of 'query'
-                            if 'sql' in arguments and 'query' not in arguments:
-                                arguments['query'] = arguments['sql']
-                                del arguments['sql']
-                            elif 'sql_query' in arguments and 'query' not in arguments:
-                                arguments['query'] = arguments['sql_query']
-                                del arguments['sql_query']
-                            result = await execute_sql(**arguments)
-                        else:
-                            result = {"error": f"Unknown tool: {tool_name}"}
-                        
+                        if isinstance(result, Exception):
+                            result = {"error": str(result)}
                         results.append({"tool": tool_name, "result": result})
-                        print(f"DEBUG: Tool result: {result}")
+                        log.debug("Tool result: %s", result)
                     
                     # If we have results, format them nicely
                     if results:
@@ -274,34 +378,38 @@ Examples:
                         return f"Based on your question, I used the following tools:\n" + "\n".join(formatted_results)
                     else:
                         return f"I analyzed your question but didn't need to use any tools.\n\nYou asked: '{prompt}'"
-                except json.JSONDecodeError as je:
+                except ValueError as je:
                     # If we can't parse as JSON, return the raw response
                     return f"LLM Response (JSON parsing error): {json_text}\nError: {str(je)}"
             except Exception as e:
                 # If there's an error with the LLM, fall back to simple responses
-                print(f"DEBUG: Error with LLM: {e}")
-                import traceback
-                traceback.print_exc()
-                pass
+                log.debug("Error with LLM: %s", e)
+                if log.isEnabledFor(logging.DEBUG):
+                    import traceback
+                    traceback.print_exc()
+            finally:
+                # Don't leave the speculative fetch running if the plan
+                # never asked for the schema
+                if not schema_task_used:
+                    schema_task.cancel()
         
         # If no API key is configured or LLM fails, provide a minimal fallback
         # that encourages using the LLM path
-        prompt_lower = prompt.lower()
-        
+
         # Handle common basic queries even without LLM
-        if "dataset" in prompt_lower and ("what" in prompt_lower or "list" in prompt_lower or "have" in prompt_lower):
+        if _DATASET_QUERY_RE.search(prompt):
             # List datasets query
             datasets = bq_client.list_datasets()
             return f"Here are your datasets: {', '.join(datasets) if datasets else 'No datasets found'}"
         
-        elif ("show" in prompt_lower or "display" in prompt_lower or "get" in prompt_lower) and "indianapi" in prompt_lower and ("row" in prompt_lower or "data" in prompt_lower or "record" in prompt_lower):
+        elif _SHOW_ROWS_RE.search(prompt):
             # Execute SQL query to show first 10 rows - this is a common basic query
             query = f"SELECT * FROM `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}` LIMIT 10"
             result = bq_client.execute_query(query)
             table_output = format_sql_results_as_table(result)
             return f"First 10 rows of {TABLE_ID} table:\n{table_output}"
         
-        elif "help" in prompt_lower or "what can" in prompt_lower:
+        elif _HELP_RE.search(prompt):
             # Provide basic help
             return f"""I'm an AI agent connected to your BigQuery data through an MCP server. 
 I can help you explore your data in the {DATASET_ID} dataset, specifically the {TABLE_ID} table.
@@ -323,6 +431,133 @@ Currently, I can help with basic dataset listing. For advanced analysis, LLM con
     except Exception as e:
         return f"Error running agent: {str(e)}"
 
+async def run_agent_batch(queries):
+    """
+    Answer several questions with a single LLM planning round trip
+
+    The questions are numbered and sent in one prompt, and the LLM returns
+    one tool plan per question; the plans then execute concurrently. This
+    cuts N planning requests to 1, which matters when rate limits are
+    per-request (RPM) rather than per-token. Falls back to per-query
+    run_agent calls if batch planning fails.
+    """
+    if not queries:
+        return []
+    if len(queries) == 1:
+        return [await run_agent(queries[0])]
+    if not ((LLM_PROVIDER == 'gemini' and GOOGLE_API_KEY) or
+            (LLM_PROVIDER == 'openai' and OPENAI_API_KEY)):
+        # No LLM: each query takes its local fallback path
+        return list(await asyncio.gather(*(run_agent(q) for q in queries)))
+
+    try:
+        numbered = "\n---\n".join(
+            f"Question {i}: {q}" for i, q in enumerate(queries, 1)
+        )
+        full_prompt = (
+            _PROMPT_PREFIX + numbered + _PROMPT_SUFFIX +
+            f"\nYou were given {len(queries)} questions separated by '---'. "
+            "Instead of the format above, return one plan per question, in "
+            "question order, using this JSON format:\n"
+            '{"plans": [{"question": 1, "tool_calls": [...]}, '
+            '{"question": 2, "tool_calls": [...]}]}\n'
+        )
+        response_text = (await generate_llm_response(full_prompt, json_output=True)).strip()
+        try:
+            decision = _json_loads(response_text)
+        except ValueError:
+            decision = _json_loads(extract_json_from_response(response_text))
+        plans = decision.get("plans", [])
+        if len(plans) != len(queries):
+            raise ValueError(f"expected {len(queries)} plans, got {len(plans)}")
+    except Exception as e:
+        log.debug("Batch planning failed, falling back to per-query agents: %s", e)
+        return list(await asyncio.gather(*(run_agent(q) for q in queries)))
+
+    async def _answer(query, plan):
+        tool_calls = plan.get("tool_calls", [])
+        raw_results = await asyncio.gather(
+            *(_dispatch_tool_call(tc.get("name"), tc.get("arguments", {}) or {})
+              for tc in tool_calls),
+            return_exceptions=True,
+        )
+        formatted_results = []
+        for tool_call, result in zip(tool_calls, raw_results):
+            tool_name = tool_call.get("name")
+            if isinstance(result, Exception):
+                result = {"error": str(result)}
+            if tool_name == 'execute_sql':
+                formatted_results.append(f"{tool_name}:\n{format_sql_results_as_table(result)}")
+            else:
+                formatted_results.append(f"{tool_name}: {result}")
+        if formatted_results:
+            return "Based on your question, I used the following tools:\n" + "\n".join(formatted_results)
+        return f"I analyzed your question but didn't need to use any tools.\n\nYou asked: '{query}'"
+
+    return list(await asyncio.gather(*(_answer(q, p) for q, p in zip(queries, plans))))
+
+async def run_agent_stream(prompt: str):
+    """
+    Streaming variant of run_agent
+
+    Yields the answer header first and then each tool's formatted result
+    as that tool finishes, so a consumer can stop early (closing the
+    generator cancels the remaining tool calls) instead of waiting for
+    the full response.
+    """
+    # Local fast paths and the no-key fallbacks produce their answer in
+    # one piece; delegate and yield it whole
+    if (not ((LLM_PROVIDER == 'gemini' and GOOGLE_API_KEY) or
+             (LLM_PROVIDER == 'openai' and OPENAI_API_KEY))
+            or _LIST_DATASETS_RE.search(prompt)
+            or _ROW_COUNT_RE.search(prompt)):
+        yield await run_agent(prompt)
+        return
+
+    try:
+        full_prompt = _PROMPT_PREFIX + prompt + _PROMPT_SUFFIX
+        chunks = []
+        async for chunk in generate_llm_response_stream(full_prompt, json_output=True):
+            chunks.append(chunk)
+        response_text = "".join(chunks).strip()
+        try:
+            tool_decision = _json_loads(response_text)
+        except ValueError:
+            tool_decision = _json_loads(extract_json_from_response(response_text))
+        tool_calls = tool_decision.get("tool_calls", [])
+    except Exception as e:
+        log.debug("Streaming plan failed, falling back to run_agent: %s", e)
+        yield await run_agent(prompt)
+        return
+
+    if not tool_calls:
+        yield f"I analyzed your question but didn't need to use any tools.\n\nYou asked: '{prompt}'"
+        return
+
+    yield "Based on your question, I used the following tools:\n"
+
+    async def _run(tool_call):
+        tool_name = tool_call.get("name")
+        try:
+            result = await _dispatch_tool_call(tool_name, tool_call.get("arguments", {}) or {})
+        except Exception as e:
+            result = {"error": str(e)}
+        return tool_name, result
+
+    tasks = [asyncio.create_task(_run(tc)) for tc in tool_calls]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            tool_name, result = await finished
+            if tool_name == 'execute_sql':
+                yield f"{tool_name}:\n{format_sql_results_as_table(result)}\n"
+            else:
+                yield f"{tool_name}: {result}\n"
+    finally:
+        # A consumer that breaks out early shouldn't leave tools running
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         prompt = " ".join(sys.argv[1:])
@@ -331,5 +566,5 @@ if __name__ == "__main__":
     else:
         print(f"BigQuery ADK Agent ({ADK_AGENT_NAME}) using {ADK_MODEL}")
         print(f"Connected to MCP Server at http://{MCP_HOST}:{MCP_PORT}")
-        print("Usage: python adk_agent.py 'Your question here'")
+        print("Usage: python -m src.adk_agent 'Your question here'")
         print("For full LLM capabilities, ensure API key is set in .env")
\ No newline at end of file
@@ -30,10 +30,34 @@ DATASET_ID = os.getenv('DATASET_ID', 'IndianAPI')
 TABLE_ID = os.getenv('TABLE_ID', 'IndianAPI')
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
 REGION = os.getenv('REGION', 'us-central1')
+# HTTP connection pool size for the BigQuery client; the urllib3 default of
+# 10 drops connections (fresh TLS handshakes) under concurrent tool calls
+BQ_POOL_SIZE = int(os.getenv('BQ_POOL_SIZE', '100'))
+# TTL for cached dataset/table metadata; schema changes on minute-to-hour
+# scales so repeated planner turns shouldn't re-fetch every time
+BQ_METADATA_TTL = int(os.getenv('BQ_METADATA_TTL', '300'))  # seconds
 
 # API Keys and Authentication
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 
+# Semantic plan cache configuration. Off by default: similarity matching
+# can treat questions differing only in literals ("top 5..." vs "top 10...")
+# as the same and serve the other question's cached answer.
+PLAN_CACHE_ENABLED = os.getenv('PLAN_CACHE_ENABLED', 'False').lower() == 'true'
+PLAN_CACHE_THRESHOLD = float(os.getenv('PLAN_CACHE_THRESHOLD', '0.92'))
+PLAN_CACHE_TTL = int(os.getenv('PLAN_CACHE_TTL', str(7 * 24 * 3600)))  # seconds
+PLAN_CACHE_PATH = os.getenv('PLAN_CACHE_PATH', 'data/plan_cache.db')
+
+# Plan-template cache: reuses the reasoning structure for repeated intents
+# while re-running the SQL against live data. Off by default because reused
+# narrative can lag behind data changes.
+PLAN_TEMPLATE_CACHE_ENABLED = os.getenv('PLAN_TEMPLATE_CACHE_ENABLED', 'False').lower() == 'true'
+
+# Disk-backed agent response cache (used by test runs to avoid repeated
+# Gemini/BigQuery round-trips for identical queries)
+LLM_CACHE_DISABLED = os.getenv('LLM_CACHE_DISABLED', 'False').lower() == 'true'
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', 'data/llm_cache.json')
+
 # Streamlit UI Configuration
 STREAMLIT_HOST = os.getenv('STREAMLIT_HOST', 'localhost')
 STREAMLIT_PORT = int(os.getenv('STREAMLIT_PORT', '8501'))
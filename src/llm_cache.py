@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Persistent response cache for the SQL agent
+Keys full agent answers by query hash so repeated identical questions
+(test runs, demo scripts) skip the Gemini and BigQuery round-trips
+"""
+
+import os
+import hashlib
+import json
+from typing import Optional
+
+# Load configuration
+from src.config import ADK_MODEL, LLM_CACHE_DISABLED, LLM_CACHE_PATH
+
+# Import the SQL agent
+from src.adk_agent import run_agent
+
+# Loaded once per process; writes go back to disk atomically
+_CACHE: Optional[dict] = None
+
+# Hit/miss counters for the stats line printed by test runs
+stats = {"hits": 0, "misses": 0}
+
+def _cache_key(query: str) -> str:
+    """Stable key over the model and the exact query text"""
+    payload = json.dumps({"model": ADK_MODEL, "query": query}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _load_cache() -> dict:
+    """Load the cache file once into a module-level dict"""
+    global _CACHE
+    if _CACHE is None:
+        try:
+            with open(LLM_CACHE_PATH) as f:
+                _CACHE = json.load(f)
+        except (OSError, ValueError):
+            _CACHE = {}
+    return _CACHE
+
+def _save_cache(cache: dict):
+    """Atomically write the cache back to disk"""
+    cache_dir = os.path.dirname(LLM_CACHE_PATH)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = LLM_CACHE_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, LLM_CACHE_PATH)
+
+async def cached_run_agent(query: str) -> str:
+    """
+    Run the SQL agent with a persistent response cache
+
+    Identical queries return the stored answer without touching Gemini or
+    BigQuery; set LLM_CACHE_DISABLED=True to always go to the agent.
+    """
+    if LLM_CACHE_DISABLED:
+        return await run_agent(query)
+
+    cache = _load_cache()
+    key = _cache_key(query)
+    cached = cache.get(key)
+    if cached is not None:
+        stats["hits"] += 1
+        return cached
+
+    stats["misses"] += 1
+    response = await run_agent(query)
+    cache[key] = response
+    _save_cache(cache)
+    return response
+
+def print_cache_stats():
+    """Print the hit/miss counters (called at the end of test runs)"""
+    print(f"LLM cache stats: {stats['hits']} hits, {stats['misses']} misses")
@@ -4,47 +4,63 @@ LLM Manager that provides a unified interface for different LLM providers
 Supports both Google Gemini and OpenAI models
 """
 
-import os
 import asyncio
+import importlib.util
 from typing import Optional, Dict, Any
 
-# Try to import configuration
-try:
-    from src.config import LLM_PROVIDER, GOOGLE_API_KEY, OPENAI_API_KEY, OPENAI_MODEL
-except ImportError:
-    # Fallback configuration if config is not available
-    LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'gemini')
-    GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-    OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4-turbo')
-
-# Try to import Google GenAI
-GOOGLE_GENAI_AVAILABLE = False
-configure = None
-GenerativeModel = None
-
-try:
+# Configuration comes from the centralized config module, which loads .env
+# exactly once; no per-module os.getenv fallback
+from src.config import LLM_PROVIDER, GOOGLE_API_KEY, OPENAI_API_KEY, OPENAI_MODEL, MCP_DEBUG
+
+# Check SDK availability without importing them: find_spec only reads the
+# importer cache, so neither heavy dependency graph (grpc/protobuf for
+# google-generativeai, httpx for openai) is loaded until first use
+GOOGLE_GENAI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
+
+if MCP_DEBUG:
+    print("Google Generative AI is available" if GOOGLE_GENAI_AVAILABLE else "Google Generative AI not available")
+    print("OpenAI is available" if OPENAI_AVAILABLE else "OpenAI not available")
+
+# Lazily-built client singletons so repeated generate calls don't pay
+# per-request client construction (and Gemini's configure() global mutation)
+_GENAI_CONFIGURED = False
+_GEMINI_MODELS: Dict[Any, Any] = {}
+_OPENAI_CLIENT = None
+
+def _get_gemini_model(model_name: str, json_output: bool):
+    """Get (or create once) the GenerativeModel for a model/config pair"""
+    global _GENAI_CONFIGURED
+    # Imported here so the SDK is only loaded when Gemini is actually used
     from google.generativeai.client import configure
     from google.generativeai.generative_models import GenerativeModel
-    GOOGLE_GENAI_AVAILABLE = True
-    print("Google Generative AI is available")
-except ImportError:
-    print("Google Generative AI not available")
-
-# Try to import OpenAI
-OPENAI_AVAILABLE = False
-AsyncOpenAI = None
-
-try:
-    from openai import AsyncOpenAI
-    OPENAI_AVAILABLE = True
-    print("OpenAI is available")
-except ImportError:
-    print("OpenAI not available")
+
+    if not _GENAI_CONFIGURED:
+        configure(api_key=GOOGLE_API_KEY)
+        _GENAI_CONFIGURED = True
+
+    key = (model_name, json_output)
+    model = _GEMINI_MODELS.get(key)
+    if model is None:
+        generation_config = {"response_mime_type": "application/json"} if json_output else None
+        model = GenerativeModel(model_name, generation_config=generation_config)
+        _GEMINI_MODELS[key] = model
+    return model
+
+def _get_openai_client():
+    """Get (or create once) the shared AsyncOpenAI client"""
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        # Imported here so the SDK is only loaded when OpenAI is actually used
+        from openai import AsyncOpenAI
+        _OPENAI_CLIENT = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _OPENAI_CLIENT
 
 class LLMManager:
     """Manages different LLM providers with a unified interface"""
-    
+
+    __slots__ = ("provider",)
+
     def __init__(self):
         self.provider = LLM_PROVIDER.lower()
         self._validate_configuration()
@@ -64,96 +80,175 @@ class LLMManager:
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
     
-    async def generate_response(self, prompt: str, model: Optional[str] = None) -> str:
+    async def generate_response(self, prompt: str, model: Optional[str] = None, json_output: bool = False) -> str:
         """
         Generate a response using the configured LLM provider
-        
+
         Args:
             prompt (str): The prompt to send to the LLM
             model (str, optional): Specific model to use (overrides default)
-            
+            json_output (bool): Request structured JSON output from the provider
+
         Returns:
             str: The generated response text
         """
         if self.provider == 'gemini':
-            return await self._generate_gemini_response(prompt, model)
+            return await self._generate_gemini_response(prompt, model, json_output)
         elif self.provider == 'openai':
-            return await self._generate_openai_response(prompt, model)
+            return await self._generate_openai_response(prompt, model, json_output)
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
-    
-    async def _generate_gemini_response(self, prompt: str, model: Optional[str] = None) -> str:
+
+    async def generate_response_stream(self, prompt: str, model: Optional[str] = None, json_output: bool = False):
+        """
+        Generate a response as an async stream of text chunks
+
+        Args:
+            prompt (str): The prompt to send to the LLM
+            model (str, optional): Specific model to use (overrides default)
+            json_output (bool): Request structured JSON output from the provider
+
+        Yields:
+            str: Response text chunks as the provider produces them
+        """
+        if self.provider == 'gemini':
+            stream = self._generate_gemini_response_stream(prompt, model, json_output)
+        elif self.provider == 'openai':
+            stream = self._generate_openai_response_stream(prompt, model, json_output)
+        else:
+            raise ValueError(f"Unsupported LLM provider: {self.provider}")
+
+        async for chunk in stream:
+            yield chunk
+
+    async def _generate_gemini_response_stream(self, prompt: str, model: Optional[str] = None, json_output: bool = False):
+        """Stream a Gemini response chunk by chunk"""
+        if not GOOGLE_GENAI_AVAILABLE:
+            raise ValueError("Google Generative AI is not available")
+
+        gemini_model = _get_gemini_model(model or 'gemini-2.5-flash', json_output)
+        response = await gemini_model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            # Safety-blocked or empty candidates have no text part
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            if text:
+                yield text
+
+    async def _generate_openai_response_stream(self, prompt: str, model: Optional[str] = None, json_output: bool = False):
+        """Stream an OpenAI response chunk by chunk"""
+        if not OPENAI_AVAILABLE:
+            raise ValueError("OpenAI library is not available")
+
+        client = _get_openai_client()
+        extra_args = {"response_format": {"type": "json_object"}} if json_output else {}
+        stream = await client.chat.completions.create(
+            model=model or OPENAI_MODEL,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2048,
+            stream=True,
+            **extra_args
+        )
+        async for event in stream:
+            delta = event.choices[0].delta.content if event.choices else None
+            if delta:
+                yield delta
+
+    async def _generate_gemini_response(self, prompt: str, model: Optional[str] = None, json_output: bool = False) -> str:
         """
         Generate a response using Google Gemini
-        
+
         Args:
             prompt (str): The prompt to send to Gemini
             model (str, optional): Specific model to use
-            
+            json_output (bool): Force a JSON response via response_mime_type
+
         Returns:
             str: The generated response text
         """
-        if not GOOGLE_GENAI_AVAILABLE or configure is None or GenerativeModel is None:
+        if not GOOGLE_GENAI_AVAILABLE:
             raise ValueError("Google Generative AI is not available")
-        
-        # Configure Google GenAI
-        configure(api_key=GOOGLE_API_KEY)
-        
+
         # Use specified model or default
         model_name = model or 'gemini-2.5-flash'
-        
-        # Create the model
-        gemini_model = GenerativeModel(model_name)
-        
+
+        # Reuse the cached model; structured JSON output means callers don't
+        # need to strip markdown code fences from the response
+        gemini_model = _get_gemini_model(model_name, json_output)
+
         # Generate the response
         response = await gemini_model.generate_content_async(prompt)
         return response.text
-    
-    async def _generate_openai_response(self, prompt: str, model: Optional[str] = None) -> str:
+
+    async def _generate_openai_response(self, prompt: str, model: Optional[str] = None, json_output: bool = False) -> str:
         """
         Generate a response using OpenAI
-        
+
         Args:
             prompt (str): The prompt to send to OpenAI
             model (str, optional): Specific model to use
-            
+            json_output (bool): Force a JSON response via response_format
+
         Returns:
             str: The generated response text
         """
-        if not OPENAI_AVAILABLE or AsyncOpenAI is None:
+        if not OPENAI_AVAILABLE:
             raise ValueError("OpenAI library is not available")
-        
-        # Create OpenAI client
-        client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        
+
+        # Reuse the shared OpenAI client
+        client = _get_openai_client()
+
         # Use specified model or default
         model_name = model or OPENAI_MODEL
-        
+
         # Generate the response
+        extra_args = {"response_format": {"type": "json_object"}} if json_output else {}
         response = await client.chat.completions.create(
             model=model_name,
             messages=[
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2048
+            max_tokens=2048,
+            **extra_args
         )
-        
+
         return response.choices[0].message.content
 
 # Create a global instance
 llm_manager = LLMManager()
 
 # Convenience function for easy access
-async def generate_llm_response(prompt: str, model: Optional[str] = None) -> str:
+async def generate_llm_response(prompt: str, model: Optional[str] = None, json_output: bool = False) -> str:
     """
     Generate an LLM response using the configured provider
-    
+
     Args:
         prompt (str): The prompt to send to the LLM
         model (str, optional): Specific model to use
-        
+        json_output (bool): Request structured JSON output from the provider
+
     Returns:
         str: The generated response text
     """
-    return await llm_manager.generate_response(prompt, model)
\ No newline at end of file
+    return await llm_manager.generate_response(prompt, model, json_output)
+
+async def generate_llm_response_stream(prompt: str, model: Optional[str] = None, json_output: bool = False):
+    """
+    Generate an LLM response as an async stream of text chunks
+
+    Args:
+        prompt (str): The prompt to send to the LLM
+        model (str, optional): Specific model to use
+        json_output (bool): Request structured JSON output from the provider
+
+    Yields:
+        str: Response text chunks as the provider produces them
+    """
+    async for chunk in llm_manager.generate_response_stream(prompt, model, json_output):
+        yield chunk
\ No newline at end of file
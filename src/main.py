@@ -3,13 +3,14 @@
 Main entry point for the BigQuery MCP application
 """
 
-import os
 import sys
+import pathlib
 import argparse
-import subprocess
+import threading
 
-# Add the parent directory to Python path to allow imports
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+# main.py is executed as a script (python src/main.py ...), so the repo
+# root must be put on sys.path for the src.* imports below
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
 
 def start_mcp_server():
     """Start the MCP server"""
@@ -21,9 +22,12 @@ def start_mcp_server():
     mcp.run(transport='streamable-http', host=MCP_HOST, port=MCP_PORT)
 
 def start_streamlit_ui():
-    """Start the Streamlit UI"""
+    """Start the Streamlit UI in-process (no child interpreter)"""
     print("Starting Streamlit UI...")
-    subprocess.run([sys.executable, "-m", "streamlit", "run", "src/streamlit_ui.py"])
+    # Bootstrapping in the current process avoids a second interpreter
+    # startup and re-importing the heavy dependency stack
+    from streamlit.web import bootstrap
+    bootstrap.run("src/streamlit_ui.py", is_hello=False, args=[], flag_options={})
 
 def main():
     """Main entry point"""
@@ -42,8 +46,9 @@ def main():
         start_streamlit_ui()
     elif args.command == "all":
         print("Starting both MCP server and Streamlit UI...")
-        print("Please run 'python src/main.py ui' in a separate terminal for the UI")
-        start_mcp_server()
+        # MCP server goes to a background thread; Streamlit owns the main thread
+        threading.Thread(target=start_mcp_server, daemon=True).start()
+        start_streamlit_ui()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,11 @@
-import os
 import asyncio
-from dotenv import load_dotenv
-from google.cloud import bigquery
+import hashlib
+import re
+import time
+
+# fastmcp must stay a top-level import: the @mcp.tool registrations below
+# run when this module loads. google-cloud-bigquery (~500ms cold import) is
+# deferred to BigQueryClient.__init__
 from fastmcp import FastMCP
 
 # Load configuration from centralized config module
@@ -11,9 +15,50 @@ from src.config import (
     MCP_DEBUG,
     PROJECT_ID,
     DATASET_ID,
-    TABLE_ID
+    TABLE_ID,
+    BQ_POOL_SIZE,
+    BQ_METADATA_TTL
+)
+
+def _is_error_result(value):
+    """Detect the error shapes the client methods return on failure"""
+    if isinstance(value, dict):
+        return "error" in value
+    if isinstance(value, list) and value:
+        first = value[0]
+        if isinstance(first, str):
+            return first.startswith("Error:")
+        if isinstance(first, dict):
+            return "error" in first
+    return False
+
+# Queries whose results change per call must not be coalesced or cached
+_NONDETERMINISTIC_SQL_RE = re.compile(
+    r"(?i)\b(?:rand|current_timestamp|current_date|current_time|current_datetime|session_user)\s*\("
 )
 
+# Short TTL for just-executed query results: long enough to absorb
+# back-to-back identical queries, short enough to stay fresh
+_QUERY_RESULT_TTL = 30  # seconds
+
+# Per-column value converters selected once from the result schema, so the
+# row loop does no per-cell type inspection. Numeric/bool values stay
+# native; everything else (timestamps, NUMERIC Decimals, ...) goes via str
+def _native_or_null(value):
+    return "NULL" if value is None else value
+
+def _str_or_null(value):
+    return "NULL" if value is None else str(value)
+
+_FIELD_CONVERTERS = {
+    "INTEGER": _native_or_null,
+    "INT64": _native_or_null,
+    "FLOAT": _native_or_null,
+    "FLOAT64": _native_or_null,
+    "BOOLEAN": _native_or_null,
+    "BOOL": _native_or_null,
+}
+
 # Initialize FastMCP server
 mcp = FastMCP("BigQuery MCP Server 🚀")
 
@@ -24,14 +69,90 @@ class BigQueryClient:
         self.default_dataset = DATASET_ID
         self.default_table = TABLE_ID
         self.client = None
+        # TTL cache for dataset/table metadata: {key: (value, expires_at)}
+        self._metadata_cache = {}
+        # Single-flight state for execute_query_async: in-flight futures and
+        # a short result cache, both keyed by normalized-SQL hash
+        self._inflight = {}
+        self._result_cache = {}
         # Only initialize the client when credentials are available
         try:
+            # Imported here so the heavy SDK only loads with the client
+            from google.cloud import bigquery
             self.client = bigquery.Client(project=self.project_id)
+            self._mount_http_adapter()
         except Exception as e:
             print(f"Warning: BigQuery client not initialized: {e}")
             print("This is expected if you haven't set up authentication yet.")
-    
+
+    def _mount_http_adapter(self):
+        """
+        Mount a larger HTTP connection pool on the client's sessions
+
+        The urllib3 default pool of 10 discards connections under concurrent
+        tool calls, forcing fresh TCP+TLS handshakes; a bigger pool keeps the
+        TLS sessions alive. Touches private attributes of the transport, so
+        failures are ignored rather than breaking client startup.
+        """
+        try:
+            import requests.adapters
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=BQ_POOL_SIZE,
+                pool_maxsize=BQ_POOL_SIZE,
+                max_retries=3
+            )
+            self.client._http.mount("https://", adapter)
+            self.client._http._auth_request.session.mount("https://", adapter)
+        except Exception as e:
+            if MCP_DEBUG:
+                print(f"Warning: could not resize BigQuery HTTP pool: {e}")
+
+    def _metadata_cached(self, key, fetch):
+        """
+        Serve metadata from the TTL cache, calling fetch() on miss/expiry
+
+        Error results are never cached so a transient failure doesn't stick
+        around for the full TTL.
+        """
+        now = time.time()
+        entry = self._metadata_cache.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        value = fetch()
+        if not _is_error_result(value):
+            self._metadata_cache[key] = (value, now + BQ_METADATA_TTL)
+        return value
+
+    def invalidate_metadata(self):
+        """Drop all cached metadata so the next calls re-fetch from BigQuery"""
+        self._metadata_cache.clear()
+
     def list_datasets(self):
+        """List all datasets in the project (cached)"""
+        return self._metadata_cached(("datasets",), self._fetch_list_datasets)
+
+    def get_dataset_info(self, dataset_id: str):
+        """Get information about a specific dataset (cached)"""
+        return self._metadata_cached(
+            ("dataset_info", dataset_id),
+            lambda: self._fetch_dataset_info(dataset_id)
+        )
+
+    def list_tables(self, dataset_id: str):
+        """List all tables in a dataset (cached)"""
+        return self._metadata_cached(
+            ("tables", dataset_id),
+            lambda: self._fetch_list_tables(dataset_id)
+        )
+
+    def get_table_info(self, dataset_id: str, table_id: str):
+        """Get information about a specific table (cached)"""
+        return self._metadata_cached(
+            ("table_info", dataset_id, table_id),
+            lambda: self._fetch_table_info(dataset_id, table_id)
+        )
+
+    def _fetch_list_datasets(self):
         """List all datasets in the project"""
         if not self.client:
             return ["Error: BigQuery client not authenticated"]
@@ -41,7 +162,7 @@ class BigQueryClient:
         except Exception as e:
             return [f"Error: {str(e)}"]
     
-    def get_dataset_info(self, dataset_id: str):
+    def _fetch_dataset_info(self, dataset_id: str):
         """Get information about a specific dataset"""
         if not self.client:
             return {"error": "BigQuery client not authenticated"}
@@ -57,7 +178,7 @@ class BigQueryClient:
         except Exception as e:
             return {"error": str(e)}
     
-    def list_tables(self, dataset_id: str):
+    def _fetch_list_tables(self, dataset_id: str):
         """List all tables in a dataset"""
         if not self.client:
             return ["Error: BigQuery client not authenticated"]
@@ -67,7 +188,7 @@ class BigQueryClient:
         except Exception as e:
             return [f"Error: {str(e)}"]
     
-    def get_table_info(self, dataset_id: str, table_id: str):
+    def _fetch_table_info(self, dataset_id: str, table_id: str):
         """Get information about a specific table"""
         if not self.client:
             return {"error": "BigQuery client not authenticated"}
@@ -83,6 +204,104 @@ class BigQueryClient:
         except Exception as e:
             return {"error": str(e)}
     
+    def _rows_from_arrow(self, query_job):
+        """
+        Fetch query results column-wise via Arrow / BQ Storage Read API
+
+        Row decoding happens in Arrow's C++ readers instead of a Python loop;
+        returns None when pyarrow or the storage client isn't available so
+        the caller can fall back to per-row iteration.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            table = query_job.to_arrow(create_bqstorage_client=True)
+        except Exception:
+            return None
+
+        # Per-column conversion preserving the row-loop semantics:
+        # NULL -> "NULL", numeric/bool stay native, everything else -> str
+        columns = []
+        for column in table.columns:
+            if (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+                    or pa.types.is_boolean(column.type)):
+                columns.append(["NULL" if value is None else value
+                                for value in column.to_pylist()])
+            elif pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                columns.append(pc.fill_null(column, "NULL").to_pylist())
+            else:
+                # Timestamps, dates, numerics etc. keep str()'s formatting
+                columns.append(["NULL" if value is None else str(value)
+                                for value in column.to_pylist()])
+
+        names = table.column_names
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    async def execute_query_async(self, query: str):
+        """
+        Execute a SQL query, coalescing concurrent identical queries
+
+        Callers issuing the same (whitespace/case-normalized) SQL while a job
+        is in flight await that job instead of starting a second one, and a
+        short result cache absorbs back-to-back repeats — each saves a full
+        BigQuery scan. Nondeterministic queries bypass both mechanisms.
+        """
+        normalized = " ".join(query.split()).lower()
+        if _NONDETERMINISTIC_SQL_RE.search(normalized):
+            return await asyncio.to_thread(self.execute_query, query)
+
+        key = hashlib.sha256(normalized.encode()).hexdigest()
+        now = time.time()
+        entry = self._result_cache.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            return await future
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            rows = await asyncio.to_thread(self.execute_query, query)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved for the no-waiter case
+            raise
+        else:
+            future.set_result(rows)
+            if not _is_error_result(rows):
+                self._result_cache[key] = (rows, time.time() + _QUERY_RESULT_TTL)
+            return rows
+        finally:
+            self._inflight.pop(key, None)
+            # Drop expired result entries so the cache can't grow unbounded
+            now = time.time()
+            if len(self._result_cache) > 64:
+                self._result_cache = {
+                    k: v for k, v in self._result_cache.items() if v[1] > now
+                }
+
+    def execute_query_with_meta(self, query: str):
+        """
+        Execute a SQL query and return rows plus structured metadata
+
+        Shape: {"rows": [...], "meta": {"row_count": n, "columns": [...]}}.
+        Lets consumers read the table shape directly instead of re-deriving
+        it from a stringified rendering.
+        """
+        rows = self.execute_query(query)
+        has_error = _is_error_result(rows)
+        columns = list(rows[0].keys()) if rows and not has_error else []
+        return {
+            "rows": rows,
+            "meta": {
+                "row_count": 0 if has_error else len(rows),
+                "columns": columns,
+                "has_error": has_error
+            }
+        }
+
     def execute_query(self, query: str):
         """Execute a SQL query and return results"""
         if not self.client:
@@ -90,52 +309,97 @@ class BigQueryClient:
         try:
             query_job = self.client.query(query)
             results = query_job.result()
-            
-            # Convert results to list of dictionaries
-            rows = []
-            for row in results:
-                row_dict = {}
-                for key, value in row.items():
-                    # Handle different data types properly
-                    if value is None:
-                        row_dict[key] = "NULL"
-                    elif isinstance(value, (int, float, bool)):
-                        row_dict[key] = value
-                    else:
-                        row_dict[key] = str(value)
-                rows.append(row_dict)
-            
-            return rows
+
+            # Prefer the vectorized Arrow path; decode rows in Python only
+            # when it isn't available
+            rows = self._rows_from_arrow(query_job)
+            if rows is not None:
+                return rows
+
+            # Convert results to list of dictionaries using per-column
+            # converters resolved once from the schema, instead of an
+            # isinstance ladder on every cell
+            schema = results.schema
+            names = [field.name for field in schema]
+            converters = [
+                _FIELD_CONVERTERS.get(field.field_type, _str_or_null)
+                for field in schema
+            ]
+            return [
+                {name: convert(value)
+                 for name, convert, value in zip(names, converters, row)}
+                for row in results
+            ]
         except Exception as e:
             return [{"error": str(e)}]
 
 # Initialize BigQuery client
 bq_client = BigQueryClient()
 
+# Tools are async and delegate to worker threads so a slow BigQuery RPC
+# doesn't block the FastMCP event loop; independent calls overlap
 @mcp.tool
-def list_dataset_ids() -> list:
+async def list_dataset_ids() -> list:
     """Fetches BigQuery dataset ids present in a GCP project."""
-    return bq_client.list_datasets()
+    return await asyncio.to_thread(bq_client.list_datasets)
 
 @mcp.tool
-def get_dataset_info(dataset_id: str) -> dict:
+async def get_dataset_info(dataset_id: str) -> dict:
     """Fetches metadata about a BigQuery dataset."""
-    return bq_client.get_dataset_info(dataset_id)
+    return await asyncio.to_thread(bq_client.get_dataset_info, dataset_id)
 
 @mcp.tool
-def list_table_ids(dataset_id: str) -> list:
+async def list_table_ids(dataset_id: str) -> list:
     """Fetches table ids present in a BigQuery dataset."""
-    return bq_client.list_tables(dataset_id)
+    return await asyncio.to_thread(bq_client.list_tables, dataset_id)
 
 @mcp.tool
-def get_table_info(dataset_id: str, table_id: str) -> dict:
+async def get_table_info(dataset_id: str, table_id: str) -> dict:
     """Fetches metadata about a BigQuery table."""
-    return bq_client.get_table_info(dataset_id, table_id)
+    return await asyncio.to_thread(bq_client.get_table_info, dataset_id, table_id)
 
 @mcp.tool
-def execute_sql(query: str) -> list:
+async def execute_sql(query: str) -> list:
     """Runs a SQL query in BigQuery and fetch the result."""
-    return bq_client.execute_query(query)
+    return await bq_client.execute_query_async(query)
+
+@mcp.tool
+async def invalidate_metadata_cache() -> str:
+    """Clears cached dataset/table metadata so the next calls re-fetch."""
+    bq_client.invalidate_metadata()
+    return "Metadata cache cleared"
+
+def _tool_doc(tool):
+    """First line of a registered tool's description or docstring"""
+    doc = (getattr(tool, "description", None)
+           or getattr(getattr(tool, "fn", None), "__doc__", None)
+           or getattr(tool, "__doc__", None)
+           or "")
+    lines = doc.strip().splitlines()
+    return lines[0] if lines else ""
+
+# Plain-dict descriptor metadata for the registered tools, built once at
+# module load from the registrations themselves so discovery paths read a
+# dict and docstring edits can't diverge from it
+TOOLS_META = {
+    name: {"name": name, "doc": _tool_doc(tool)}
+    for name, tool in (
+        ("list_dataset_ids", list_dataset_ids),
+        ("get_dataset_info", get_dataset_info),
+        ("list_table_ids", list_table_ids),
+        ("get_table_info", get_table_info),
+        ("execute_sql", execute_sql),
+        ("invalidate_metadata_cache", invalidate_metadata_cache),
+    )
+}
+
+async def gather_metadata(dataset_id: str) -> dict:
+    """Fetch a dataset's info and table list concurrently."""
+    info, tables = await asyncio.gather(
+        asyncio.to_thread(bq_client.get_dataset_info, dataset_id),
+        asyncio.to_thread(bq_client.list_tables, dataset_id)
+    )
+    return {"dataset_info": info, "tables": tables}
 
 if __name__ == "__main__":
     print(f"Starting BigQuery MCP Server on http://{MCP_HOST}:{MCP_PORT}")
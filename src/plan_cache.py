@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Semantic cache for Planning Agent responses
+Stores answered queries with an embedding so near-duplicate questions can be
+served without re-running the SQL agent and the reasoning LLM
+"""
+
+import os
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from typing import Optional, Tuple
+
+# Load configuration from centralized config module
+from src.config import (
+    LLM_PROVIDER,
+    GOOGLE_API_KEY,
+    OPENAI_API_KEY,
+    PLAN_CACHE_THRESHOLD,
+    PLAN_CACHE_TTL,
+    PLAN_CACHE_PATH
+)
+
+# numpy accelerates the cosine lookup when installed; the pure-Python
+# fallback is fine for the handful of entries a single session accumulates
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+def _cosine_similarity(a, b) -> float:
+    """Cosine similarity between two embedding vectors"""
+    if NUMPY_AVAILABLE:
+        a = np.asarray(a)
+        b = np.asarray(b)
+        denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+        return float(np.dot(a, b)) / denom if denom else 0.0
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sum(x * x for x in a) ** 0.5
+    norm_b = sum(x * x for x in b) ** 0.5
+    denom = norm_a * norm_b
+    return dot / denom if denom else 0.0
+
+async def embed_query(text: str) -> Optional[list]:
+    """
+    Compute an embedding for a query using the configured LLM provider
+
+    Returns:
+        list: The embedding vector, or None if no embedding model is available
+    """
+    try:
+        if LLM_PROVIDER == 'gemini' and GOOGLE_API_KEY:
+            # Imported lazily so the SDK only loads when embeddings are used
+            import google.generativeai as genai
+            result = await asyncio.to_thread(
+                genai.embed_content,
+                model="models/text-embedding-004",
+                content=text
+            )
+            return list(result["embedding"])
+        elif LLM_PROVIDER == 'openai' and OPENAI_API_KEY:
+            from src.llm_manager import _get_openai_client
+            client = _get_openai_client()
+            response = await client.embeddings.create(
+                model="text-embedding-3-small",
+                input=text
+            )
+            return list(response.data[0].embedding)
+    except Exception as e:
+        print(f"Plan cache: embedding failed: {e}")
+    return None
+
+class SemanticPlanCache:
+    """
+    Embedding-indexed cache of planner answers backed by SQLite
+
+    Rows are (query, sql_response, enhanced_response, embedding, timestamp);
+    embeddings are also kept in memory for the cosine lookup.
+    """
+
+    def __init__(self, db_path: str = PLAN_CACHE_PATH,
+                 threshold: float = PLAN_CACHE_THRESHOLD,
+                 ttl: int = PLAN_CACHE_TTL):
+        self.threshold = threshold
+        self.ttl = ttl
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS plan_cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                query TEXT NOT NULL,
+                sql_response TEXT NOT NULL,
+                enhanced_response TEXT NOT NULL,
+                embedding TEXT NOT NULL,
+                ts REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        # In-memory view of (embedding, sql_response, enhanced_response)
+        self._entries = []
+        self._load()
+
+    def _load(self):
+        """Load unexpired rows into memory, pruning expired ones"""
+        cutoff = time.time() - self.ttl
+        self._conn.execute("DELETE FROM plan_cache WHERE ts < ?", (cutoff,))
+        self._conn.commit()
+        self._entries = [
+            (json.loads(embedding), sql_response, enhanced_response)
+            for embedding, sql_response, enhanced_response in self._conn.execute(
+                "SELECT embedding, sql_response, enhanced_response FROM plan_cache"
+            )
+        ]
+
+    def get(self, embedding: list) -> Optional[Tuple[str, str]]:
+        """
+        Look up the most similar cached entry
+
+        Returns:
+            tuple: (sql_response, enhanced_response) when the best match
+            clears the similarity threshold, otherwise None
+        """
+        best_score = 0.0
+        best = None
+        for cached_embedding, sql_response, enhanced_response in self._entries:
+            score = _cosine_similarity(embedding, cached_embedding)
+            if score > best_score:
+                best_score = score
+                best = (sql_response, enhanced_response)
+        if best is not None and best_score >= self.threshold:
+            return best
+        return None
+
+    def put(self, query: str, sql_response: str, enhanced_response: str, embedding: list):
+        """Store an answered query with its embedding"""
+        self._conn.execute(
+            "INSERT INTO plan_cache (query, sql_response, enhanced_response, embedding, ts) VALUES (?, ?, ?, ?, ?)",
+            (query, sql_response, enhanced_response, json.dumps(embedding), time.time())
+        )
+        self._conn.commit()
+        self._entries.append((embedding, sql_response, enhanced_response))
+
+# Marker substituted into stored templates where the live SQL response goes
+TEMPLATE_PLACEHOLDER = "{sql_response}"
+
+# Specifics that vary between otherwise-identical intents: backticked
+# identifiers, quoted strings, and numeric literals
+_INTENT_SPECIFICS_RE = re.compile(r"`[^`]*`|'[^']*'|\"[^\"]*\"|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def _normalize_intent(query: str) -> str:
+    """
+    Reduce a query to a canonical intent signature
+
+    Identifiers, quoted strings and numbers are masked so queries that differ
+    only in specifics (table, filter value, limit) hash to the same intent.
+    """
+    canonical = _INTENT_SPECIFICS_RE.sub("?", query.lower())
+    canonical = _WHITESPACE_RE.sub(" ", canonical).strip()
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+class PlanTemplateCache:
+    """
+    Cache of reasoning templates keyed by normalized intent
+
+    Unlike the semantic cache this never reuses data: on a hit the SQL agent
+    still runs, and the cached template is re-filled with the fresh response,
+    saving only the reasoning LLM call.
+    """
+
+    def __init__(self, db_path: str = PLAN_CACHE_PATH, ttl: int = PLAN_CACHE_TTL):
+        self.ttl = ttl
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS plan_template_cache (
+                intent_hash TEXT PRIMARY KEY,
+                template TEXT NOT NULL,
+                ts REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, query: str) -> Optional[str]:
+        """Look up the reasoning template for this query's intent"""
+        intent_hash = _normalize_intent(query)
+        row = self._conn.execute(
+            "SELECT template, ts FROM plan_template_cache WHERE intent_hash = ?",
+            (intent_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        template, ts = row
+        if ts < time.time() - self.ttl:
+            self._conn.execute(
+                "DELETE FROM plan_template_cache WHERE intent_hash = ?", (intent_hash,)
+            )
+            self._conn.commit()
+            return None
+        return template
+
+    def put(self, query: str, template: str):
+        """Store (or refresh) the reasoning template for this query's intent"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO plan_template_cache (intent_hash, template, ts) VALUES (?, ?, ?)",
+            (_normalize_intent(query), template, time.time())
+        )
+        self._conn.commit()
+
+# Lazily-created shared cache instances
+_PLAN_CACHE = None
+_TEMPLATE_CACHE = None
+
+def get_plan_cache() -> SemanticPlanCache:
+    """Get (or create once) the shared SemanticPlanCache"""
+    global _PLAN_CACHE
+    if _PLAN_CACHE is None:
+        _PLAN_CACHE = SemanticPlanCache()
+    return _PLAN_CACHE
+
+def get_template_cache() -> PlanTemplateCache:
+    """Get (or create once) the shared PlanTemplateCache"""
+    global _TEMPLATE_CACHE
+    if _TEMPLATE_CACHE is None:
+        _TEMPLATE_CACHE = PlanTemplateCache()
+    return _TEMPLATE_CACHE
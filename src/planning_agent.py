@@ -3,15 +3,9 @@
 Planning Agent that orchestrates the SQL Agent and adds intelligent reasoning
 """
 
-import os
 import sys
 import asyncio
-import json
 import re
-from dotenv import load_dotenv
-
-# Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
 # Load configuration
 from src.config import (
@@ -19,16 +13,33 @@ from src.config import (
     LLM_PROVIDER,
     GOOGLE_API_KEY,
     OPENAI_API_KEY,
+    PLAN_CACHE_ENABLED,
+    PLAN_TEMPLATE_CACHE_ENABLED,
     PROJECT_ID,
     DATASET_ID,
     TABLE_ID
 )
 
+# Import the semantic and template plan caches
+from src.plan_cache import (
+    TEMPLATE_PLACEHOLDER,
+    embed_query,
+    get_plan_cache,
+    get_template_cache
+)
+
 # Import the SQL agent (current ADK agent)
 from src.adk_agent import run_agent as run_sql_agent
 
 # Import LLM manager
-from src.llm_manager import generate_llm_response
+from src.llm_manager import generate_llm_response, generate_llm_response_stream
+
+# Key availability can't change within a process, so decide once at import
+# instead of re-checking provider/key pairs on every request
+_REASONING_AVAILABLE = bool(
+    (LLM_PROVIDER == 'gemini' and GOOGLE_API_KEY) or
+    (LLM_PROVIDER == 'openai' and OPENAI_API_KEY)
+)
 
 async def run_planning_agent(user_query: str):
     """
@@ -41,36 +52,140 @@ async def run_planning_agent(user_query: str):
         str: Enhanced response with planning and reasoning
     """
     print(f"Planning Agent received query: {user_query}")
-    
+
+    # Without an API key, complex handling degenerates to the simple path
+    # anyway, so skip the keyword scan and the embedding attempt entirely
+    if not _REASONING_AVAILABLE:
+        return await _handle_simple_query(user_query)
+
+    # Check the semantic cache: near-duplicate questions skip both the SQL
+    # agent and the reasoning LLM entirely
+    query_embedding = None
+    if PLAN_CACHE_ENABLED:
+        query_embedding = await embed_query(user_query)
+        if query_embedding is not None:
+            cached = get_plan_cache().get(query_embedding)
+            if cached is not None:
+                print("Planning Agent: semantic cache hit, returning cached answer")
+                return cached[1]
+
     # First, let's determine if this query needs complex reasoning or can be handled directly
     needs_complex_reasoning = _needs_complex_reasoning(user_query)
-    
+
     if needs_complex_reasoning:
         # For complex queries, we'll break them down and add reasoning
-        return await _handle_complex_query(user_query)
+        return await _handle_complex_query(user_query, query_embedding)
     else:
         # For simple queries, just relay the SQL agent's response
         return await _handle_simple_query(user_query)
 
+async def run_planning_agent_stream(user_query: str):
+    """
+    Streaming variant of run_planning_agent
+
+    Yields the SQL agent's response as soon as it is available, then the
+    reasoning analysis chunk by chunk, so the UI can render incrementally
+    instead of waiting for both stages to finish.
+    """
+    print(f"Planning Agent received query: {user_query}")
+
+    # Same no-key short-circuit as the blocking path
+    if not _REASONING_AVAILABLE:
+        yield await _handle_simple_query(user_query)
+        return
+
+    # Cache hits arrive complete, so they are yielded in one piece
+    query_embedding = None
+    if PLAN_CACHE_ENABLED:
+        query_embedding = await embed_query(user_query)
+        if query_embedding is not None:
+            cached = get_plan_cache().get(query_embedding)
+            if cached is not None:
+                print("Planning Agent: semantic cache hit, returning cached answer")
+                yield cached[1]
+                return
+
+    if not _needs_complex_reasoning(user_query):
+        yield await _handle_simple_query(user_query)
+        return
+
+    print("Planning Agent: Handling complex query with reasoning")
+    sql_response = await run_sql_agent(user_query)
+
+    if PLAN_TEMPLATE_CACHE_ENABLED:
+        template = get_template_cache().get(user_query)
+        if template is not None:
+            print("Planning Agent: plan-template cache hit, skipping reasoning LLM")
+            yield template.replace(TEMPLATE_PLACEHOLDER, sql_response)
+            return
+
+    # Yield the raw data immediately, then stream the reasoning as the
+    # LLM produces it
+    prefix = f"## Original Response\n{sql_response}\n\n## Enhanced Analysis\n"
+    yield prefix
+    chunks = []
+    try:
+        print("Planning Agent: Generating reasoning with LLM...")
+        async for chunk in generate_llm_response_stream(_build_reasoning_prompt(user_query, sql_response)):
+            chunks.append(chunk)
+            yield chunk
+    except Exception as e:
+        print(f"Planning Agent: Error in reasoning generation: {e}")
+        yield f"\nUnable to generate enhanced analysis due to: {str(e)}\n"
+        return
+
+    # Populate the caches with the assembled answer, mirroring
+    # _handle_complex_query
+    enhanced_response = f"{prefix}{''.join(chunks)}\n"
+    if PLAN_TEMPLATE_CACHE_ENABLED and sql_response in enhanced_response:
+        get_template_cache().put(
+            user_query,
+            enhanced_response.replace(sql_response, TEMPLATE_PLACEHOLDER)
+        )
+    if PLAN_CACHE_ENABLED and query_embedding is not None:
+        get_plan_cache().put(user_query, sql_response, enhanced_response, query_embedding)
+
+# Keywords that indicate a query needs complex reasoning, precompiled into a
+# single alternation so each query is scanned once instead of per keyword.
+# Word boundaries avoid false positives; IGNORECASE replaces lower()
+_COMPLEX_KEYWORDS = (
+    'analyze', 'analysis', 'compare', 'trend', 'pattern', 'insight',
+    'relationship', 'correlation', 'forecast', 'predict', 'summary',
+    'recommend', 'suggestion', 'why', 'how', 'explain', 'understand'
+)
+_COMPLEX_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, _COMPLEX_KEYWORDS)) + r')\b',
+    re.IGNORECASE
+)
+
+# pyahocorasick gives a single linear DFA scan over the query; the union
+# regex above remains the fallback when the package isn't installed
+try:
+    import ahocorasick
+    _COMPLEX_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _COMPLEX_KEYWORDS:
+        _COMPLEX_AUTOMATON.add_word(_keyword, _keyword)
+    _COMPLEX_AUTOMATON.make_automaton()
+except ImportError:
+    _COMPLEX_AUTOMATON = None
+
 def _needs_complex_reasoning(query: str) -> bool:
     """
     Determine if a query needs complex reasoning based on keywords
     Uses word boundary matching to avoid false positives
     """
-    complex_keywords = [
-        'analyze', 'analysis', 'compare', 'trend', 'pattern', 'insight', 
-        'relationship', 'correlation', 'forecast', 'predict', 'summary',
-        'recommend', 'suggestion', 'why', 'how', 'explain', 'understand'
-    ]
-    
+    if _COMPLEX_AUTOMATON is None:
+        return _COMPLEX_RE.search(query) is not None
     query_lower = query.lower()
-    # Use word boundary matching to avoid false positives
-    for keyword in complex_keywords:
-        # Create a regex pattern with word boundaries
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, query_lower):
-            return True
-    
+    for end_index, keyword in _COMPLEX_AUTOMATON.iter(query_lower):
+        # Re-check word boundaries: the automaton matches substrings
+        # ("howdy" contains "how"), which \b would have rejected
+        start_index = end_index - len(keyword) + 1
+        if start_index > 0 and query_lower[start_index - 1].isalnum():
+            continue
+        if end_index + 1 < len(query_lower) and query_lower[end_index + 1].isalnum():
+            continue
+        return True
     return False
 
 async def _handle_simple_query(user_query: str) -> str:
@@ -81,41 +196,45 @@ async def _handle_simple_query(user_query: str) -> str:
     sql_response = await run_sql_agent(user_query)
     return sql_response
 
-async def _handle_complex_query(user_query: str) -> str:
+async def _handle_complex_query(user_query: str, query_embedding=None) -> str:
     """
     Handle complex queries by adding reasoning and planning
     """
     print("Planning Agent: Handling complex query with reasoning")
-    
-    # First, get the raw data from the SQL agent
+
+    # First, get the raw data from the SQL agent. Both callers already
+    # returned via their _REASONING_AVAILABLE short-circuit, so an API
+    # key is guaranteed here
     sql_response = await run_sql_agent(user_query)
-    
-    # Then, enhance it with reasoning if we have an API key available
-    if (LLM_PROVIDER == 'gemini' and GOOGLE_API_KEY) or (LLM_PROVIDER == 'openai' and OPENAI_API_KEY):
-        enhanced_response = await _add_reasoning(user_query, sql_response)
-        return enhanced_response
-    else:
-        # Without API key, return the SQL response with a note
-        note = ""
-        if LLM_PROVIDER == 'gemini' and not GOOGLE_API_KEY:
-            note = "Note: For detailed analysis and insights, please configure your GOOGLE_API_KEY in the .env file.\n\n"
-        elif LLM_PROVIDER == 'openai' and not OPENAI_API_KEY:
-            note = "Note: For detailed analysis and insights, please configure your OPENAI_API_KEY in the .env file.\n\n"
-        
-        return f"{note}{sql_response}"
-    
-async def _add_reasoning(original_query: str, sql_response: str) -> str:
-    """
-    Add intelligent reasoning to the SQL response using LLM
-    """
-    try:
-        # Create the reasoning prompt
-        reasoning_prompt = f"""
-You are an expert data analyst and business intelligence consultant. Your task is to analyze SQL query results and provide insightful, actionable interpretations.
 
-Original User Query: {original_query}
+    # A cached reasoning template for this intent skips the reasoning
+    # LLM call; the fresh SQL response is substituted into it
+    if PLAN_TEMPLATE_CACHE_ENABLED:
+        template = get_template_cache().get(user_query)
+        if template is not None:
+            print("Planning Agent: plan-template cache hit, skipping reasoning LLM")
+            return template.replace(TEMPLATE_PLACEHOLDER, sql_response)
+
+    enhanced_response = await _add_reasoning(user_query, sql_response)
 
-SQL Agent Response: {sql_response}
+    # Store the reasoning structure with the data section masked out so
+    # the template can be re-filled with future responses
+    if PLAN_TEMPLATE_CACHE_ENABLED and sql_response in enhanced_response:
+        get_template_cache().put(
+            user_query,
+            enhanced_response.replace(sql_response, TEMPLATE_PLACEHOLDER)
+        )
+
+    # Store the full answer so near-duplicate questions hit the cache
+    if PLAN_CACHE_ENABLED and query_embedding is not None:
+        get_plan_cache().put(user_query, sql_response, enhanced_response, query_embedding)
+    return enhanced_response
+
+# All the fixed instruction text lives in one constant prefix and the
+# per-call query/response go at the end, so the provider's prompt cache
+# sees an identical leading prefix on every complex query
+_REASONING_PREFIX = """
+You are an expert data analyst and business intelligence consultant. Your task is to analyze SQL query results and provide insightful, actionable interpretations.
 
 Please provide a comprehensive analysis that includes:
 
@@ -127,8 +246,21 @@ Please provide a comprehensive analysis that includes:
 
 Format your response in a clear, professional manner suitable for business stakeholders.
 Use markdown formatting for better readability with headers, bullet points, and emphasis where appropriate.
+
 """
-        
+
+def _build_reasoning_prompt(original_query: str, sql_response: str) -> str:
+    """Build the analysis prompt shared by the blocking and streaming paths"""
+    return f"{_REASONING_PREFIX}Original User Query: {original_query}\n\nSQL Agent Response: {sql_response}\n"
+
+async def _add_reasoning(original_query: str, sql_response: str) -> str:
+    """
+    Add intelligent reasoning to the SQL response using LLM
+    """
+    try:
+        # Create the reasoning prompt
+        reasoning_prompt = _build_reasoning_prompt(original_query, sql_response)
+
         print("Planning Agent: Generating reasoning with LLM...")
         # Generate the reasoning response using our LLM manager
         response_text = await generate_llm_response(reasoning_prompt)
@@ -154,12 +286,24 @@ Unable to generate enhanced analysis due to: {str(e)}
 The raw data from the SQL query is shown above.
 """
 
-def _extract_key_metrics(sql_response: str) -> dict:
+def _extract_key_metrics(sql_response) -> dict:
     """
     Extract key metrics from SQL response for quick analysis
+
+    Prefers the structured {"rows", "meta"} shape from
+    execute_query_with_meta — O(1) reads instead of string scans — and
+    falls back to parsing the stringified response.
     """
-    # This is a simplified extraction - in a real implementation, 
-    # you would parse the actual data structure
+    if isinstance(sql_response, dict) and "meta" in sql_response:
+        meta = sql_response["meta"]
+        return {
+            "response_length": len(sql_response.get("rows", [])),
+            "has_error": meta.get("has_error", False),
+            "has_table": meta.get("row_count", 0) > 0,
+            "row_count": meta.get("row_count", 0)
+        }
+
+    # Legacy string path - a simplified extraction from the rendered form
     metrics = {
         "response_length": len(sql_response),
         "has_error": "error" in sql_response.lower(),
@@ -175,5 +319,5 @@ if __name__ == "__main__":
         print(response)
     else:
         print("Planning Agent")
-        print("Usage: python planning_agent.py 'Your question here'")
+        print("Usage: python -m src.planning_agent 'Your question here'")
         print("This agent orchestrates the SQL agent and adds intelligent reasoning")
\ No newline at end of file
@@ -6,6 +6,7 @@ Streamlit UI for interacting with the BigQuery Planning Agent
 import os
 import sys
 import asyncio
+import threading
 import streamlit as st
 from dotenv import load_dotenv
 
@@ -16,7 +17,30 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'
 load_dotenv()
 
 # Import the Planning agent
-from src.planning_agent import run_planning_agent
+from src.planning_agent import run_planning_agent_stream
+
+def _get_event_loop():
+    """
+    Get the session's persistent background event loop, creating it once
+
+    Reusing one loop across chat turns keeps the LLM SDKs' HTTP sessions
+    (connection pools, resolved DNS) alive instead of rebuilding them on
+    every asyncio.run
+    """
+    if 'loop' not in st.session_state:
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        st.session_state.loop = loop
+    return st.session_state.loop
+
+def _to_sync_iter(async_gen):
+    """Bridge an async generator to the sync iterator st.write_stream expects"""
+    loop = _get_event_loop()
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(anext(async_gen), loop).result()
+        except StopAsyncIteration:
+            break
 
 # Load configuration from centralized config module
 from src.config import (
@@ -44,6 +68,13 @@ st.markdown(f"This agent connects to BigQuery data through an MCP server running
 if 'messages' not in st.session_state:
     st.session_state.messages = []
 
+# Pin the BigQuery client to the session: importing it here warms the
+# client (auth, HTTP pool, metadata caches) at page load instead of on the
+# first chat turn, and keeps it alive across reruns
+if 'bq_client' not in st.session_state:
+    from src.mcp_server import bq_client
+    st.session_state.bq_client = bq_client
+
 # Display chat history
 for message in st.session_state.messages:
     with st.chat_message(message["role"]):
@@ -58,17 +89,14 @@ if prompt := st.chat_input("Ask a question about your BigQuery data..."):
     
     # Add assistant response to chat history
     with st.chat_message("assistant"):
-        message_placeholder = st.empty()
-        
-        # Run the Planning agent to get the response
+        # Stream the Planning agent's response: the SQL answer shows up as
+        # soon as it's ready, then the reasoning renders chunk by chunk
         try:
-            full_response = asyncio.run(run_planning_agent(prompt))
+            full_response = st.write_stream(_to_sync_iter(run_planning_agent_stream(prompt)))
         except Exception as e:
             full_response = f"Error running agent: {str(e)}"
-        
-        # Display the response
-        message_placeholder.markdown(full_response)
-    
+            st.markdown(full_response)
+
     st.session_state.messages.append({"role": "assistant", "content": full_response})
 
 # Sidebar with information
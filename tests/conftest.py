@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Path setup and shared fixtures for the test scripts
+Resolves the repository root onto sys.path once and exposes the
+session-scoped bq_client fixture. The scripts themselves are script-first
+(python tests/test_mcp.py); running them under pytest additionally needs
+pytest and pytest-asyncio installed, which the project does not declare.
+"""
+
+import sys
+import pathlib
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture(scope="session")
+def bq_client():
+    """
+    Warm-started BigQuery client shared across the whole session
+
+    The list_datasets() call pays the ADC credential resolution and
+    primes the metadata cache once, so every test that accepts this
+    fixture reuses the same authenticated client.
+    """
+    from src import mcp_server
+    client = mcp_server.bq_client
+    client.list_datasets()
+    return client
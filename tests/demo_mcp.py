@@ -4,13 +4,13 @@ Demo script for testing BigQuery MCP Server functionality
 This script demonstrates how to interact with the MCP server programmatically.
 """
 
-import os
 import sys
+import pathlib
 import asyncio
 from dotenv import load_dotenv
 
 # Add the parent directory to Python path to allow imports
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
 
 # Load environment variables
 load_dotenv()
@@ -57,23 +57,13 @@ async def demo_mcp_functionality():
         
         print("\n3. Testing MCP Tool Objects:")
         print("-" * 40)
-        tools = [
-            'list_dataset_ids',
-            'get_dataset_info', 
-            'list_table_ids',
-            'get_table_info',
-            'execute_sql'
-        ]
-        
-        for tool_name in tools:
-            tool = getattr(mcp_server, tool_name, None)
-            if tool:
+        # TOOLS_META is precomputed at registration; no need to reflect
+        # over the FunctionTool wrappers here
+        for tool_name, meta in mcp_server.TOOLS_META.items():
+            if getattr(mcp_server, tool_name, None):
                 print(f"✓ Tool '{tool_name}' is available")
-                # Show tool metadata if available
-                if hasattr(tool, '__name__'):
-                    print(f"  Function name: {getattr(tool, '__name__', 'N/A')}")
-                if hasattr(tool, '__doc__') and tool.__doc__:
-                    print(f"  Description: {tool.__doc__.strip()}")
+                print(f"  Function name: {meta['name']}")
+                print(f"  Description: {meta['doc']}")
             else:
                 print(f"✗ Tool '{tool_name}' is missing")
         
@@ -4,25 +4,34 @@ Integration tests for BigQuery MCP Server
 This script tests the actual functionality of the BigQuery MCP server with real operations.
 """
 
-import os
 import sys
+import pathlib
 import asyncio
 from dotenv import load_dotenv
 
 # Add the parent directory to Python path to allow imports
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
 
 # Load environment variables
 load_dotenv()
 
+# Memoized dataset list so the three tests that need it share one RPC
+_DATASETS = None
+
+def _get_datasets():
+    """Fetch the dataset list once and reuse it across tests"""
+    global _DATASETS
+    if _DATASETS is None:
+        from src import mcp_server
+        _DATASETS = mcp_server.bq_client.list_datasets()
+    return _DATASETS
+
 def test_list_datasets():
     """Test listing datasets"""
     try:
-        from src import mcp_server
-        
         # Test the actual list_datasets functionality
-        datasets = mcp_server.bq_client.list_datasets()
-        
+        datasets = _get_datasets()
+
         print(f"✓ Successfully listed datasets: {len(datasets)} found")
         if datasets:
             print(f"  Sample datasets: {datasets[:3]}")  # Show first 3 datasets
@@ -35,10 +44,10 @@ def test_get_dataset_info():
     """Test getting dataset information"""
     try:
         from src import mcp_server
-        
-        # First get a list of datasets
-        datasets = mcp_server.bq_client.list_datasets()
-        
+
+        # Reuse the memoized dataset list
+        datasets = _get_datasets()
+
         if datasets and len(datasets) > 0:
             # Test with the first dataset
             first_dataset = datasets[0]
@@ -62,10 +71,10 @@ def test_list_tables():
     """Test listing tables in a dataset"""
     try:
         from src import mcp_server
-        
-        # First get a list of datasets
-        datasets = mcp_server.bq_client.list_datasets()
-        
+
+        # Reuse the memoized dataset list
+        datasets = _get_datasets()
+
         if datasets and len(datasets) > 0:
             # Test with the first dataset
             first_dataset = datasets[0]
@@ -6,62 +6,63 @@ This script runs all essential tests for the BigQuery MCP server.
 
 import os
 import sys
+import pathlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'src'))
 
 def run_test_script(script_name):
-    """Run a test script and return the result"""
+    """Run a test script and return (script_name, passed, output)"""
     try:
-        print(f"\n{'='*60}")
-        print(f"Running {script_name}")
-        print(f"{'='*60}")
-        
         # Run the test script
         result = subprocess.run([
-            sys.executable, 
+            sys.executable,
             os.path.join(os.path.dirname(os.path.abspath(__file__)), script_name)
         ], capture_output=True, text=True)
-        
-        print(result.stdout)
+
+        output = result.stdout
         if result.stderr:
-            print("STDERR:", result.stderr)
-        
-        return result.returncode == 0
+            output += "STDERR: " + result.stderr
+
+        return script_name, result.returncode == 0, output
     except Exception as e:
-        print(f"Failed to run {script_name}: {e}")
-        return False
+        return script_name, False, f"Failed to run {script_name}: {e}"
 
 def main():
     """Run all tests"""
     print("Running All BigQuery MCP Server Tests\n")
-    
+
     test_scripts = [
         "test_mcp.py",
-        "integration_test.py", 
+        "integration_test.py",
         "demo_mcp.py",
         "test_mcp_http.py"
     ]
-    
+
     passed = 0
     total = len(test_scripts)
-    
-    for script in test_scripts:
-        try:
-            result = run_test_script(script)
-            if result:
+
+    # The scripts are independent processes, so run them concurrently and
+    # print each one's captured output as it completes; wall time becomes
+    # max(script runtimes) instead of their sum
+    with ThreadPoolExecutor(max_workers=total) as executor:
+        for script, ok, output in executor.map(run_test_script, test_scripts):
+            print(f"\n{'='*60}")
+            print(f"Running {script}")
+            print(f"{'='*60}")
+            print(output)
+            if ok:
                 passed += 1
                 print(f"✅ {script} PASSED")
             else:
                 print(f"❌ {script} FAILED")
-        except Exception as e:
-            print(f"❌ {script} FAILED with exception: {e}")
-    
+
     print(f"\n{'='*60}")
     print(f"Test Results: {passed}/{total} test scripts passed")
     print(f"{'='*60}")
-    
+
     if passed == total:
         print("🎉 All tests passed!")
         return 0
@@ -70,4 +71,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -6,40 +6,123 @@ This script tests the functionality of the BigQuery MCP server.
 
 import os
 import sys
+import pathlib
+import time
 import asyncio
+import inspect
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 from unittest.mock import Mock, patch
 
 # Add the parent directory to Python path to allow imports
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
 
 # Load environment variables
 load_dotenv()
 
+# Output lines are buffered and written in one writelines call at the end
+# of main(): one syscall instead of dozens of flushing prints, and no
+# interleaved partial lines when tests run concurrently
+_LOG = []
+
+def log(message):
+    """Append one output line to the buffer"""
+    _LOG.append(f"{message}\n")
+
+def _flush_log():
+    """Write the buffered output in a single syscall"""
+    sys.stdout.writelines(_LOG)
+    _LOG.clear()
+    sys.stdout.flush()
+
+# Tool names registered by the MCP server, shared by the tool tests
+TOOLS = (
+    'list_dataset_ids',
+    'get_dataset_info',
+    'list_table_ids',
+    'get_table_info',
+    'execute_sql'
+)
+
+# Per-test wall times in milliseconds, keyed by test function name
+TIMINGS = {}
+
+def timed(fn):
+    """Record each call's wall time in TIMINGS so slow tests stand out"""
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                TIMINGS[fn.__name__] = (time.perf_counter_ns() - start) / 1e6
+        return wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            TIMINGS[fn.__name__] = (time.perf_counter_ns() - start) / 1e6
+    return wrapper
+
+def _log_timings(timings):
+    """Log the per-test wall-time table, slowest first"""
+    if not timings:
+        return
+    log("\nPer-test wall time (ms):")
+    for name, ms in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+        log(f"  {name:<32} {ms:10.1f}")
+
+# The server module and its resolved tool objects are loaded once and
+# reused by every test that needs them
+_SERVER = None
+_TOOL_CACHE = {}
+
+def _server():
+    """Load src.mcp_server once and precompute the tool lookup dict"""
+    global _SERVER
+    if _SERVER is None:
+        from src import mcp_server
+        _SERVER = mcp_server
+        _TOOL_CACHE.update({name: getattr(mcp_server, name, None) for name in TOOLS})
+    return _SERVER
+
+@timed
 def test_imports():
-    """Test that all required modules can be imported"""
+    """Test that all required modules are available"""
     try:
-        import dotenv
-        import google.cloud.bigquery
-        import fastmcp
-        print("✓ All imports successful")
+        import importlib.util
+        # find_spec confirms each package is installed without executing
+        # its top-level code (google-cloud-bigquery alone costs ~100-300ms)
+        missing = [
+            name for name in ("dotenv", "google.cloud.bigquery", "fastmcp")
+            if importlib.util.find_spec(name) is None
+        ]
+        if missing:
+            log(f"✗ Missing packages: {', '.join(missing)}")
+            return False
+        log("✓ All imports successful")
         return True
     except Exception as e:
-        print(f"✗ Import failed: {e}")
+        log(f"✗ Import failed: {e}")
         return False
 
-def test_bigquery_client():
+@timed
+def test_bigquery_client(bq_client):
     """Test BigQuery client initialization"""
     try:
-        # Import the module and access the client
-        from src import mcp_server
-        client = mcp_server.bq_client
-        print("✓ BigQuery client initialized successfully (may not be authenticated yet)")
+        client = bq_client
+        log("✓ BigQuery client initialized successfully (may not be authenticated yet)")
         return True
     except Exception as e:
-        print(f"✗ BigQuery client initialization failed: {e}")
+        log(f"✗ BigQuery client initialization failed: {e}")
         return False
 
+@timed
 def test_environment_variables():
     """Test that required environment variables are set"""
     required_vars = ['PROJECT_ID']
@@ -50,168 +133,201 @@ def test_environment_variables():
             missing_vars.append(var)
     
     if missing_vars:
-        print(f"✗ Missing environment variables: {', '.join(missing_vars)}")
+        log(f"✗ Missing environment variables: {', '.join(missing_vars)}")
         return False
     else:
-        print("✓ All required environment variables are set")
-        print(f"  PROJECT_ID: {os.getenv('PROJECT_ID', 'Not set')}")
+        log("✓ All required environment variables are set")
+        log(f"  PROJECT_ID: {os.getenv('PROJECT_ID', 'Not set')}")
         return True
 
+@timed
 async def test_mcp_server():
     """Test MCP server functionality"""
     try:
         # Import the MCP server
-        from src import mcp_server
-        print("✓ MCP server module loaded successfully")
+        _server()
+        log("✓ MCP server module loaded successfully")
         return True
     except Exception as e:
-        print(f"✗ MCP server test failed: {e}")
+        log(f"✗ MCP server test failed: {e}")
         return False
 
+@timed
 def test_mcp_tools():
     """Test that all MCP tools are properly defined"""
     try:
-        from src import mcp_server
-        
-        # Check that all tools are defined
-        tools = [
-            'list_dataset_ids',
-            'get_dataset_info',
-            'list_table_ids',
-            'get_table_info',
-            'execute_sql'
-        ]
-        
-        # Verify tools exist as functions
-        for tool_name in tools:
-            if hasattr(mcp_server, tool_name):
-                print(f"✓ Tool '{tool_name}' is defined")
-            else:
-                print(f"✗ Tool '{tool_name}' is missing")
-                return False
-        
-        print("✓ All MCP tools are properly defined")
+        # One set-subset check replaces a hasattr probe per tool
+        missing = set(TOOLS) - set(vars(_server()))
+        if missing:
+            for tool_name in sorted(missing):
+                log(f"✗ Tool '{tool_name}' is missing")
+            return False
+
+        log("✓ All MCP tools are properly defined")
         return True
     except Exception as e:
-        print(f"✗ MCP tools test failed: {e}")
+        log(f"✗ MCP tools test failed: {e}")
         return False
 
-def test_bigquery_client_methods():
+@timed
+def test_bigquery_client_methods(bq_client):
     """Test BigQuery client methods without authentication"""
     try:
-        from src import mcp_server
-        
         # Test each method when client is not authenticated
-        client = mcp_server.bq_client
+        client = bq_client
         
         # Test list_datasets method
         result = client.list_datasets()
         assert isinstance(result, list), "list_datasets should return a list"
-        print("✓ list_datasets method works correctly")
+        log("✓ list_datasets method works correctly")
         
         # Test get_dataset_info method
         result = client.get_dataset_info("test_dataset")
         assert isinstance(result, dict), "get_dataset_info should return a dict"
-        print("✓ get_dataset_info method works correctly")
+        log("✓ get_dataset_info method works correctly")
         
         # Test list_tables method
         result = client.list_tables("test_dataset")
         assert isinstance(result, list), "list_tables should return a list"
-        print("✓ list_tables method works correctly")
+        log("✓ list_tables method works correctly")
         
         # Test get_table_info method
         result = client.get_table_info("test_dataset", "test_table")
         assert isinstance(result, dict), "get_table_info should return a dict"
-        print("✓ get_table_info method works correctly")
+        log("✓ get_table_info method works correctly")
         
         # Test execute_query method
         result = client.execute_query("SELECT 1")
         assert isinstance(result, list), "execute_query should return a list"
-        print("✓ execute_query method works correctly")
+        log("✓ execute_query method works correctly")
         
-        print("✓ All BigQuery client methods work correctly")
+        log("✓ All BigQuery client methods work correctly")
         return True
     except Exception as e:
-        print(f"✗ BigQuery client methods test failed: {e}")
+        log(f"✗ BigQuery client methods test failed: {e}")
         return False
 
+@timed
 def test_mcp_tool_functions():
     """Test MCP tool functions"""
     try:
-        from src import mcp_server
-        
+        _server()
+
         # Test that tools exist as FunctionTool objects
-        tools = [
-            'list_dataset_ids',
-            'get_dataset_info',
-            'list_table_ids',
-            'get_table_info',
-            'execute_sql'
-        ]
-        
-        for tool_name in tools:
-            tool = getattr(mcp_server, tool_name, None)
+        for tool_name in TOOLS:
+            tool = _TOOL_CACHE.get(tool_name)
             if tool is not None:
-                print(f"✓ Tool '{tool_name}' exists as a FunctionTool object")
+                log(f"✓ Tool '{tool_name}' exists as a FunctionTool object")
             else:
-                print(f"✗ Tool '{tool_name}' is missing")
+                log(f"✗ Tool '{tool_name}' is missing")
                 return False
         
-        print("✓ All MCP tool functions are properly defined as FunctionTool objects")
+        log("✓ All MCP tool functions are properly defined as FunctionTool objects")
         return True
     except Exception as e:
-        print(f"✗ MCP tool functions test failed: {e}")
+        log(f"✗ MCP tool functions test failed: {e}")
         return False
 
-def test_error_handling():
+@timed
+def test_error_handling(bq_client):
     """Test error handling in BigQuery client methods"""
     try:
-        from src import mcp_server
-        
-        client = mcp_server.bq_client
+        client = bq_client
         
         # Check if client is authenticated
         is_authenticated = client.client is not None
         
         if is_authenticated:
-            print("✓ Client is authenticated - testing normal operation")
+            log("✓ Client is authenticated - testing normal operation")
             # Test normal operation when authenticated
             datasets = client.list_datasets()
             assert isinstance(datasets, list), "list_datasets should return a list"
-            print("✓ list_datasets works correctly when authenticated")
+            log("✓ list_datasets works correctly when authenticated")
             
             # Test with a non-existent dataset to trigger error
             dataset_info = client.get_dataset_info("non_existent_dataset_12345")
             assert isinstance(dataset_info, dict), "get_dataset_info should return a dict"
             # Check if it contains error information
             has_error = "error" in dataset_info or "notFound" in str(dataset_info).lower()
-            print("✓ Error handling for non-existent dataset works correctly")
+            log("✓ Error handling for non-existent dataset works correctly")
             
         else:
-            print("✓ Client is not authenticated - testing error handling")
+            log("✓ Client is not authenticated - testing error handling")
             # Test that methods return appropriate error messages when not authenticated
             datasets = client.list_datasets()
             assert len(datasets) > 0, "Should return error message when not authenticated"
             assert "Error" in datasets[0] or "error" in str(datasets[0]), "Should contain error indication"
-            print("✓ Error handling for list_datasets works correctly")
+            log("✓ Error handling for list_datasets works correctly")
             
             dataset_info = client.get_dataset_info("test")
             assert "error" in dataset_info, "Should contain error key"
-            print("✓ Error handling for get_dataset_info works correctly")
+            log("✓ Error handling for get_dataset_info works correctly")
             
         return True
     except Exception as e:
-        print(f"✗ Error handling test failed: {e}")
+        log(f"✗ Error handling test failed: {e}")
+        return False
+
+def _call_test(test_func):
+    """Invoke a test, supplying the shared client when it asks for one
+
+    Under pytest the bq_client parameter is the session fixture from
+    conftest.py; here the scripts pass the same singleton themselves.
+    """
+    if inspect.signature(test_func).parameters:
+        return test_func(_server().bq_client)
+    return test_func()
+
+def _run_one(test_name, test_func):
+    """Run one test in this process, logging under its heading"""
+    log(f"\n{test_name}:")
+    try:
+        if asyncio.iscoroutinefunction(test_func):
+            return asyncio.run(test_func())
+        return _call_test(test_func)
+    except Exception as e:
+        log(f"✗ {test_name} failed with exception: {e}")
         return False
 
+def _run_in_worker(test_name, test_func):
+    """
+    Run one test in a worker process, returning (result, output lines,
+    timings)
+
+    Each worker pays the heavy imports (google-cloud-bigquery, fastmcp)
+    independently, so they overlap across cores, and a crashing test
+    takes down only its own process. The worker's log buffer is returned
+    so the parent can splice the output back together in test order.
+    """
+    _LOG.clear()  # a forked worker inherits the parent's buffer
+    log(f"\n{test_name}:")
+    try:
+        if asyncio.iscoroutinefunction(test_func):
+            result = asyncio.run(test_func())
+        else:
+            result = _call_test(test_func)
+    except Exception as e:
+        log(f"✗ {test_name} failed with exception: {e}")
+        result = False
+    return result, list(_LOG), dict(TIMINGS)
+
 def main():
     """Run all tests"""
-    print("Running BigQuery MCP Server Tests\n")
-    
+    log("Running BigQuery MCP Server Tests\n")
+
+    # Deterministic precondition first: with PROJECT_ID unset, every
+    # BigQuery-dependent test fails anyway, so bail before paying their
+    # heavy imports (google-cloud-bigquery, fastmcp)
+    log("Environment Variables Test:")
+    if not test_environment_variables():
+        log("\n⚠ Skipping remaining tests: required environment is not configured")
+        log("\n\nTest Results: 0/1 tests passed")
+        log("❌ Some tests failed!")
+        return 1
+
     tests = [
         ("Import Tests", test_imports),
         ("BigQuery Client Test", test_bigquery_client),
-        ("Environment Variables Test", test_environment_variables),
         ("MCP Server Test", test_mcp_server),
         ("MCP Tools Test", test_mcp_tools),
         ("BigQuery Client Methods Test", test_bigquery_client_methods),
@@ -219,31 +335,54 @@ def main():
         ("Error Handling Test", test_error_handling),
     ]
     
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        print(f"\n{test_name}:")
-        try:
-            if asyncio.iscoroutinefunction(test_func):
-                result = asyncio.run(test_func())
-            else:
-                result = test_func()
+    # The env check above already passed
+    total = len(tests) + 1
+    passed = 1
+
+    if '--fail-fast' in sys.argv[1:]:
+        # all() short-circuits on the first failing test, skipping the
+        # remaining network-bound ones on a broken environment
+        if not all(_run_one(name, func) for name, func in tests):
+            log("\n⚠ Fail-fast: remaining tests skipped after first failure")
+            _log_timings(TIMINGS)
+            log("\n\n❌ Some tests failed!")
+            return 1
+        passed = total
+        _log_timings(TIMINGS)
+        log(f"\n\nTest Results: {passed}/{total} tests passed")
+        log("🎉 All tests passed!")
+        return 0
+
+    # Fan the tests out across worker processes; results and output are
+    # collected back in the original test order
+    with ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(_run_in_worker, name, func) for name, func in tests]
+        timings = dict(TIMINGS)  # the env check ran in this process
+        for (test_name, _), future in zip(tests, futures):
+            try:
+                result, lines, worker_timings = future.result()
+            except Exception as e:
+                result = False
+                lines = [f"\n{test_name}:\n", f"✗ {test_name} failed with exception: {e}\n"]
+                worker_timings = {}
+            _LOG.extend(lines)
+            timings.update(worker_timings)
             if result:
                 passed += 1
-        except Exception as e:
-            print(f"✗ {test_name} failed with exception: {e}")
-            import traceback
-            traceback.print_exc()
+
+    _log_timings(timings)
     
-    print(f"\n\nTest Results: {passed}/{total} tests passed")
+    log(f"\n\nTest Results: {passed}/{total} tests passed")
     
     if passed == total:
-        print("🎉 All tests passed!")
+        log("🎉 All tests passed!")
         return 0
     else:
-        print("❌ Some tests failed!")
+        log("❌ Some tests failed!")
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    try:
+        sys.exit(main())
+    finally:
+        _flush_log()
\ No newline at end of file
@@ -5,62 +5,147 @@ Test script to verify the MCP server is running with HTTP
 
 import os
 import sys
-import requests
+import pathlib
+import asyncio
+import atexit
 import time
+import httpx
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    import json
+    _json_loads = json.loads
+
 # Add the src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent / 'src'))
 
 # Load environment variables
 load_dotenv()
 
-# Get configuration from environment
-MCP_HOST = os.getenv('MCP_HOST', 'localhost')
-MCP_PORT = int(os.getenv('MCP_PORT', '8000'))
+@dataclass(frozen=True, slots=True)
+class Env:
+    """Immutable snapshot of the environment taken once at module load"""
+    MCP_HOST: str
+    MCP_PORT: int
+    PROJECT_ID: Optional[str]
+
+ENV = Env(
+    MCP_HOST=os.environ.get('MCP_HOST', 'localhost'),
+    MCP_PORT=int(os.environ.get('MCP_PORT', '8000')),
+    PROJECT_ID=os.environ.get('PROJECT_ID')
+)
+
+# Output lines are buffered and written in one writelines call at the end
+# of the run instead of flushing per print
+_LOG = []
+
+def log(message):
+    """Append one output line to the buffer"""
+    _LOG.append(f"{message}\n")
+
+def _flush_log():
+    """Write the buffered output in a single syscall"""
+    sys.stdout.writelines(_LOG)
+    _LOG.clear()
+    sys.stdout.flush()
+
+def _make_client():
+    """One keep-alive client for the whole run; HTTP/2 when h2 is installed"""
+    limits = httpx.Limits(max_keepalive_connections=4)
+    try:
+        return httpx.Client(http2=True, timeout=5.0, limits=limits)
+    except ImportError:
+        return httpx.Client(timeout=5.0, limits=limits)
+
+# Both tests reuse this client, so the TCP/TLS handshake happens once
+_CLIENT = _make_client()
+atexit.register(_CLIENT.close)
+
+async def _fetch_many(urls, max_at_once=5, max_per_second=10.0):
+    """
+    Fetch URLs concurrently with bounded parallelism and request rate
+
+    The semaphore caps in-flight requests and the staggered start paces
+    dispatch, so probing many endpoints doesn't trip a remote gateway's
+    rate limits (429-retry storms cost more than the throttle saves).
+    """
+    semaphore = asyncio.Semaphore(max_at_once)
+    interval = 1.0 / max_per_second
+
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        async def fetch(index, url):
+            await asyncio.sleep(index * interval)
+            async with semaphore:
+                return await client.get(url)
+
+        return await asyncio.gather(
+            *(fetch(i, url) for i, url in enumerate(urls)),
+            return_exceptions=True
+        )
 
 def test_mcp_server():
     """Test if the MCP server is running"""
     try:
         # Try to connect to the MCP server
-        url = f"http://{MCP_HOST}:{MCP_PORT}/health"
-        response = requests.get(url, timeout=5)
+        url = f"http://{ENV.MCP_HOST}:{ENV.MCP_PORT}/health"
+        response = _CLIENT.get(url)
         if response.status_code == 200:
-            print(f"✓ MCP Server is running at http://{MCP_HOST}:{MCP_PORT}")
+            log(f"✓ MCP Server is running at http://{ENV.MCP_HOST}:{ENV.MCP_PORT}")
             return True
         else:
-            print(f"✗ MCP Server returned status code: {response.status_code}")
+            log(f"✗ MCP Server returned status code: {response.status_code}")
             return False
-    except requests.exceptions.ConnectionError:
-        print(f"✗ Could not connect to MCP Server at http://{MCP_HOST}:{MCP_PORT}")
-        print("  Make sure the server is running with: python src/mcp_server.py")
+    except httpx.ConnectError:
+        log(f"✗ Could not connect to MCP Server at http://{ENV.MCP_HOST}:{ENV.MCP_PORT}")
+        log("  Make sure the server is running with: python src/mcp_server.py")
         return False
     except Exception as e:
-        print(f"✗ Error testing MCP Server: {e}")
+        log(f"✗ Error testing MCP Server: {e}")
         return False
 
 def test_mcp_tools():
     """Test if the MCP tools are available"""
     try:
         # Try to get the tools list
-        url = f"http://{MCP_HOST}:{MCP_PORT}/tools"
-        response = requests.get(url, timeout=5)
+        url = f"http://{ENV.MCP_HOST}:{ENV.MCP_PORT}/tools"
+        response = _CLIENT.get(url)
         if response.status_code == 200:
-            tools = response.json()
-            print(f"✓ MCP Tools are available: {len(tools)} tools found")
+            # orjson's C parser beats response.json() once the tool
+            # catalog grows past a few KB
+            tools = _json_loads(response.content)
+            log(f"✓ MCP Tools are available: {len(tools)} tools found")
             for tool in tools:
-                print(f"  - {tool.get('name', 'Unknown')}: {tool.get('description', 'No description')}")
+                log(f"  - {tool.get('name', 'Unknown')}: {tool.get('description', 'No description')}")
+
+            # If the listing links per-tool detail endpoints, probe them
+            # all with bounded concurrency instead of one by one
+            detail_urls = [
+                tool["url"] for tool in tools
+                if isinstance(tool, dict) and "url" in tool
+            ]
+            if detail_urls:
+                responses = asyncio.run(_fetch_many(detail_urls))
+                ok = sum(
+                    1 for r in responses
+                    if not isinstance(r, Exception) and r.status_code == 200
+                )
+                log(f"  Probed {ok}/{len(detail_urls)} tool endpoints successfully")
             return True
         else:
-            print(f"✗ MCP Tools endpoint returned status code: {response.status_code}")
+            log(f"✗ MCP Tools endpoint returned status code: {response.status_code}")
             return False
     except Exception as e:
-        print(f"✗ Error testing MCP Tools: {e}")
+        log(f"✗ Error testing MCP Tools: {e}")
         return False
 
 def main():
     """Run all tests"""
-    print("Testing BigQuery MCP Server (HTTP)\n")
+    log("Testing BigQuery MCP Server (HTTP)\n")
     
     tests = [
         ("MCP Server Connection Test", test_mcp_server),
@@ -71,22 +156,25 @@ def main():
     total = len(tests)
     
     for test_name, test_func in tests:
-        print(f"\n{test_name}:")
+        log(f"\n{test_name}:")
         try:
             result = test_func()
             if result:
                 passed += 1
         except Exception as e:
-            print(f"✗ {test_name} failed with exception: {e}")
+            log(f"✗ {test_name} failed with exception: {e}")
     
-    print(f"\n\nTest Results: {passed}/{total} tests passed")
+    log(f"\n\nTest Results: {passed}/{total} tests passed")
     
     if passed == total:
-        print("🎉 All tests passed!")
+        log("🎉 All tests passed!")
         return 0
     else:
-        print("❌ Some tests failed!")
+        log("❌ Some tests failed!")
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    try:
+        sys.exit(main())
+    finally:
+        _flush_log()
\ No newline at end of file